@@ -215,8 +215,11 @@ class FirewallOptimizerCLI:
         if args.output or args.apply:
             if args.backup:
                 print(Colors.info("Creating backup..."))
-                backup_path = self.backup_manager.create_backup(config, "Pre-optimization backup")
-                print(Colors.success(f"Backup created: {backup_path}"))
+                backup_path, created = self.backup_manager.create_backup(config, "Pre-optimization backup")
+                if created:
+                    print(Colors.success(f"Backup created: {backup_path}"))
+                else:
+                    print(Colors.info(f"Config unchanged; latest backup is {backup_path}"))
             
             # Generate optimized configuration
             optimized_config = self.recommender.generate_optimized_config(config, plan)
@@ -265,7 +268,7 @@ class FirewallOptimizerCLI:
         for viz_type, file_path in files_created.items():
             print(f"  {Colors.BRIGHT_GREEN}✓{Colors.RESET} {Colors.highlight(viz_type)}: {Colors.CYAN}{file_path}{Colors.RESET}")
         
-        print(f"\n{Colors.success('🌐 Open')} {Colors.highlight(f'{output_dir}/rule_flow.html')} {Colors.success('in your browser to view the report.')}")
+        print(f"\n{Colors.success('🌐 Open')} {Colors.highlight(f'{output_dir}/index.html')} {Colors.success('in your browser to view the report.')}")
         print_separator()
     
     def cmd_webapp(self, args):
@@ -302,10 +305,13 @@ class FirewallOptimizerCLI:
             content = self.system_interface.get_current_rules()
             config = self.parser.parse_iptables_save(content)
         
-        backup_path = self.backup_manager.create_backup(
+        backup_path, created = self.backup_manager.create_backup(
             config, args.description or "Manual backup"
         )
-        print(f"Backup created: {backup_path}")
+        if created:
+            print(f"Backup created: {backup_path}")
+        else:
+            print(f"Config unchanged; latest backup is {backup_path}")
     
     def cmd_restore(self, args):
         """Execute restore command"""
@@ -331,12 +337,7 @@ class FirewallOptimizerCLI:
         print(f"\n{Colors.subheader('🔍 Detailed Issue Breakdown')}")
         
         if analysis.issues:
-            from collections import defaultdict
-            issues_by_type = defaultdict(list)
-            for issue in analysis.issues:
-                issues_by_type[issue.issue_type].append(issue)
-            
-            for issue_type, issues in issues_by_type.items():
+            for issue_type, issues in analysis.issues_by_type.items():
                 issue_type_name = issue_type.value.title()
                 print(f"\n  {Colors.warning('⚠️')} {Colors.highlight(issue_type_name)} {Colors.count(len(issues), 'issues')}:")
                 
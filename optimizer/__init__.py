@@ -38,6 +38,8 @@ __version__ = "1.0.0"
 __author__ = "Firewall Optimizer Team"
 __email__ = "contact@firewalloptimizer.com"
 
+import importlib
+
 # Import main classes for easy access
 from .parser import (
     IptablesParser,
@@ -57,17 +59,29 @@ from .analyzer import (
     IssueSeverity
 )
 
-from .recommender import (
-    FirewallRecommender,
-    OptimizationPlan,
-    Recommendation,
-    RecommendationType,
-    RecommendationPriority
-)
+# The recommender and visualizer (matplotlib, plotly, pandas)
+# are imported on first access so parsing and analysis stay cheap to import
+_LAZY_IMPORTS = {
+    'FirewallRecommender': '.recommender',
+    'OptimizationPlan': '.recommender',
+    'Recommendation': '.recommender',
+    'RecommendationType': '.recommender',
+    'RecommendationPriority': '.recommender',
+    'FirewallVisualizer': '.visualizer'
+}
 
-from .visualizer import (
-    FirewallVisualizer
-)
+def __getattr__(name):
+    """Import lazily exported components on first access"""
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
 
 from .cli_graphics import (
     CLIGraphics
@@ -9,6 +9,7 @@ This module analyzes parsed firewall rules to identify issues like:
 - Security vulnerabilities
 """
 
+import sys
 import logging
 from typing import Dict, List, Tuple, Set, Optional
 from dataclasses import dataclass, field
@@ -18,6 +19,10 @@ from collections import defaultdict
 
 from .parser import FirewallRule, FirewallConfig, RuleAction
 
+# dataclass(slots=True) needs Python 3.10; older interpreters get a regular
+# __dict__-backed class
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
 
 class IssueType(Enum):
     """Types of issues that can be found in firewall rules"""
@@ -49,21 +54,30 @@ class RuleIssue:
     confidence: float = 1.0  # 0.0 to 1.0
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class AnalysisResult:
     """Results of firewall rule analysis"""
     issues: List[RuleIssue] = field(default_factory=list)
     statistics: Dict[str, int] = field(default_factory=dict)
     rule_efficiency_score: float = 0.0
     security_score: float = 0.0
+    # Issues grouped by type in the order each type was first found; built
+    # from issues on creation and kept up to date by add_issue
+    issues_by_type: Dict[IssueType, List[RuleIssue]] = field(default_factory=dict, init=False)
+    
+    def __post_init__(self):
+        """Group issues passed to the constructor by type"""
+        for issue in self.issues:
+            self.issues_by_type.setdefault(issue.issue_type, []).append(issue)
     
     def add_issue(self, issue: RuleIssue):
         """Add an issue to the results"""
         self.issues.append(issue)
+        self.issues_by_type.setdefault(issue.issue_type, []).append(issue)
     
     def get_issues_by_type(self, issue_type: IssueType) -> List[RuleIssue]:
         """Get all issues of a specific type"""
-        return [issue for issue in self.issues if issue.issue_type == issue_type]
+        return list(self.issues_by_type.get(issue_type, ()))
     
     def get_issues_by_severity(self, severity: IssueSeverity) -> List[RuleIssue]:
         """Get all issues of a specific severity"""
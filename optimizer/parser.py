@@ -7,9 +7,10 @@ iptables-save output, individual rule strings, and configuration files.
 
 import re
 import logging
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Any, Union
 from dataclasses import dataclass, field
 from enum import Enum
+from types import MappingProxyType
 
 
 class RuleAction(Enum):
@@ -40,10 +41,18 @@ class ChainPolicy(Enum):
     REJECT = "REJECT"
 
 
-@dataclass
+@dataclass(eq=False)
 class FirewallRule:
     """
     Represents a single firewall rule with all its components
+
+    Rules intentionally compare and hash by identity rather than
+    field-by-field, so membership tests against rule lists and sets are
+    cheap pointer checks. Two separately parsed rules with identical fields
+    are therefore *not* equal; code that needs value comparison should use
+    the analyzer's rule signature, and code matching rules across copies of
+    a configuration (such as the optimizer's deletions) matches them by
+    ``line_number``.
     """
     table: str = "filter"
     chain: str = ""
@@ -69,6 +78,17 @@ class FirewallRule:
         else:
             self.action = RuleAction.JUMP
             self.jump_target = self.target
+        self.is_catchall_drop = _is_catchall_drop(self)
+
+
+def _is_catchall_drop(rule: FirewallRule) -> bool:
+    """Check if a rule drops all traffic without any matching criteria"""
+    return (rule.target == "DROP" and
+            not rule.protocol and
+            not rule.source_ip and
+            not rule.destination_ip and
+            not rule.source_port and
+            not rule.destination_port)
 
 
 @dataclass
@@ -87,6 +107,30 @@ class FirewallConfig:
     tables: Dict[str, Dict[str, List[FirewallRule]]] = field(default_factory=dict)
     chains: Dict[str, ChainInfo] = field(default_factory=dict)
     comments: List[str] = field(default_factory=list)
+    # (table, chain) pairs of built-in filter chains whose last rule is not a
+    # catch-all DROP; None when the configuration was not produced by the parser
+    chains_missing_default_drop: Optional[Set[Tuple[str, str]]] = None
+    # Number of rules in tables; kept by the parser and reset with
+    # count_rules() by code that rebuilds or edits the tables
+    rule_count: int = 0
+    
+    def count_rules(self) -> int:
+        """Recount the rules in all tables and store the result in rule_count"""
+        self.rule_count = sum(len(rules) for chains in self.tables.values()
+                              for rules in chains.values())
+        return self.rule_count
+    
+    def find_chains_missing_default_drop(self) -> Set[Tuple[str, str]]:
+        """Find built-in filter chains that do not end with an explicit DROP rule"""
+        missing = set()
+        chains = self.tables.get("filter", {})
+        
+        for chain_name in ["INPUT", "FORWARD", "OUTPUT"]:
+            rules = chains.get(chain_name)
+            if rules and not rules[-1].is_catchall_drop:
+                missing.add(("filter", chain_name))
+        
+        return missing
 
 
 class IptablesParser:
@@ -94,45 +138,67 @@ class IptablesParser:
     Parser for iptables rules and configurations
     """
     
+    # Regex patterns are compiled once when the module is imported and
+    # shared by every parser instance
+    
+    # Basic rule pattern
+    rule_pattern = re.compile(
+        r'^-A\s+(\S+)\s+(.*)$'
+    )
+    
+    # Chain definition pattern
+    chain_pattern = re.compile(
+        r'^:(\S+)\s+(\S+)\s+\[(\d+):(\d+)\]$'
+    )
+    
+    # Table pattern
+    table_pattern = re.compile(r'^\*(\w+)$')
+    
+    # Parameter patterns
+    param_patterns = MappingProxyType({
+        'protocol': re.compile(r'-p\s+(\S+)'),
+        'source': re.compile(r'-s\s+(\S+)'),
+        'destination': re.compile(r'-d\s+(\S+)'),
+        'sport': re.compile(r'--sport\s+(\S+)'),
+        'dport': re.compile(r'--dport\s+(\S+)'),
+        'in_interface': re.compile(r'-i\s+(\S+)'),
+        'out_interface': re.compile(r'-o\s+(\S+)'),
+        'target': re.compile(r'-j\s+(\S+)'),
+        'state': re.compile(r'--ctstate\s+(\S+)'),
+        'module': re.compile(r'-m\s+(\S+)')
+    })
+    
+    # Whitespace-separated tokens, keeping quoted strings whole
+    _token_pattern = re.compile(r'(?:[^\s,"]|"(?:\\.|[^"])*")+')
+    
+    # Rule part of an "iptables ..." command line
+    _command_pattern = re.compile(r'iptables\s+(.+)')
+    
     def __init__(self):
         self.logger = logging.getLogger(__name__)
-        self._setup_regex_patterns()
     
-    def _setup_regex_patterns(self):
-        """Setup regex patterns for parsing"""
-        # Basic rule pattern
-        self.rule_pattern = re.compile(
-            r'^-A\s+(\S+)\s+(.*)$'
-        )
-        
-        # Chain definition pattern
-        self.chain_pattern = re.compile(
-            r'^:(\S+)\s+(\S+)\s+\[(\d+):(\d+)\]$'
-        )
+    def parse_iptables_save(self, content: Union[str, bytes]) -> FirewallConfig:
+        """
+        Parse iptables-save output into a structured configuration
         
-        # Table pattern
-        self.table_pattern = re.compile(r'^\*(\w+)$')
+        Args:
+            content: Content from iptables-save, as text or raw UTF-8 bytes
+            
+        Returns:
+            FirewallConfig object containing parsed rules and chains
+        """
+        if isinstance(content, bytes):
+            content = content.decode('utf-8', errors='replace')
         
-        # Parameter patterns
-        self.param_patterns = {
-            'protocol': re.compile(r'-p\s+(\S+)'),
-            'source': re.compile(r'-s\s+(\S+)'),
-            'destination': re.compile(r'-d\s+(\S+)'),
-            'sport': re.compile(r'--sport\s+(\S+)'),
-            'dport': re.compile(r'--dport\s+(\S+)'),
-            'in_interface': re.compile(r'-i\s+(\S+)'),
-            'out_interface': re.compile(r'-o\s+(\S+)'),
-            'target': re.compile(r'-j\s+(\S+)'),
-            'state': re.compile(r'--ctstate\s+(\S+)'),
-            'module': re.compile(r'-m\s+(\S+)')
-        }
+        return self.parse_iptables_save_lines(content.strip().split('\n'))
     
-    def parse_iptables_save(self, content: str) -> FirewallConfig:
+    def parse_iptables_save_lines(self, lines: Iterable[str]) -> FirewallConfig:
         """
-        Parse iptables-save output into a structured configuration
+        Parse iptables-save output given line by line
         
         Args:
-            content: String content from iptables-save
+            lines: Lines of iptables-save output, e.g. an open text file;
+                they are consumed one at a time
             
         Returns:
             FirewallConfig object containing parsed rules and chains
@@ -141,11 +207,13 @@ class IptablesParser:
         current_table = "filter"
         line_number = 0
         
-        lines = content.strip().split('\n')
-        
         for line in lines:
-            line_number += 1
             line = line.strip()
+            # Leading blank lines are not numbered, matching
+            # parse_iptables_save, which strips them from the content
+            if not line and line_number == 0:
+                continue
+            line_number += 1
             
             # Skip empty lines and comments (except table markers)
             if not line or (line.startswith('#') and not line.startswith('# Generated')):
@@ -204,6 +272,9 @@ class IptablesParser:
                     config.tables[current_table][chain_name] = []
                 
                 config.tables[current_table][chain_name].append(rule)
+                config.rule_count += 1
+        
+        config.chains_missing_default_drop = config.find_chains_missing_default_drop()
         
         return config
     
@@ -258,6 +329,7 @@ class IptablesParser:
         
         # Store all parameters for advanced analysis
         rule.parameters = self._extract_all_parameters(params)
+        rule.is_catchall_drop = _is_catchall_drop(rule)
         
         return rule
     
@@ -274,7 +346,7 @@ class IptablesParser:
         parameters = {}
         
         # Split by spaces but preserve quoted strings
-        tokens = re.findall(r'(?:[^\s,"]|"(?:\\.|[^"])*")+', params)
+        tokens = self._token_pattern.findall(params)
         
         i = 0
         while i < len(tokens):
@@ -310,7 +382,7 @@ class IptablesParser:
         # Handle different rule formats
         if rule_string.startswith('iptables'):
             # Extract the actual rule part
-            rule_match = re.search(r'iptables\s+(.+)', rule_string)
+            rule_match = self._command_pattern.search(rule_string)
             if rule_match:
                 params = rule_match.group(1)
             else:
@@ -7,9 +7,11 @@ efficiency, security, and maintainability.
 """
 
 import logging
-from typing import Dict, List, Tuple, Optional, Set
+from typing import Dict, List, Tuple, Optional, Set, Sequence
 from dataclasses import dataclass, field
 from enum import Enum
+from operator import attrgetter
+from collections import defaultdict
 import copy
 
 from .parser import FirewallRule, FirewallConfig
@@ -65,14 +67,64 @@ class Recommendation:
 
 @dataclass
 class OptimizationPlan:
-    """Complete optimization plan with all recommendations"""
-    recommendations: List[Recommendation] = field(default_factory=list)
+    """
+    Complete optimization plan with all recommendations
+    
+    Recommendations are collected in a list while the plan is being built.
+    finalize() sorts them by priority once and freezes them into a tuple;
+    no further recommendations can be added after that.
+    """
+    recommendations: Sequence[Recommendation] = field(default_factory=list)
     estimated_savings: Dict[str, float] = field(default_factory=dict)
     backup_required: bool = True
+    # Running totals maintained by add_recommendation
+    _deleted_rule_count: int = field(default=0, init=False, repr=False)
+    _security_rec_count: int = field(default=0, init=False, repr=False)
+    _finalized: bool = field(default=False, init=False, repr=False)
+    
+    def __post_init__(self):
+        """Count recommendations passed to the constructor"""
+        self.recommendations = list(self.recommendations)
+        for recommendation in self.recommendations:
+            self._count(recommendation)
+    
+    @property
+    def finalized(self) -> bool:
+        """Whether the recommendations have been sorted and frozen"""
+        return self._finalized
+    
+    @property
+    def deleted_rule_count(self) -> int:
+        """Number of rules affected by DELETE_RULE recommendations"""
+        return self._deleted_rule_count
+    
+    @property
+    def security_rec_count(self) -> int:
+        """Number of RESTRICT_SOURCE and ADD_LOGGING recommendations"""
+        return self._security_rec_count
     
     def add_recommendation(self, recommendation: Recommendation):
         """Add a recommendation to the plan"""
+        if self._finalized:
+            raise RuntimeError("Cannot add recommendations to a finalized plan")
+        
         self.recommendations.append(recommendation)
+        self._count(recommendation)
+    
+    def _count(self, recommendation: Recommendation):
+        """Add a recommendation to the running totals"""
+        if recommendation.rec_type == RecommendationType.DELETE_RULE:
+            self._deleted_rule_count += len(recommendation.affected_rules)
+        elif recommendation.rec_type in (RecommendationType.RESTRICT_SOURCE,
+                                         RecommendationType.ADD_LOGGING):
+            self._security_rec_count += 1
+    
+    def finalize(self):
+        """Sort recommendations by priority (highest first) and freeze them"""
+        self.recommendations = tuple(sorted(self.recommendations,
+                                            key=attrgetter('priority.value'),
+                                            reverse=True))
+        self._finalized = True
     
     def get_by_priority(self, priority: RecommendationPriority) -> List[Recommendation]:
         """Get all recommendations of a specific priority"""
@@ -120,7 +172,7 @@ class FirewallRecommender:
         plan.estimated_savings = self._calculate_estimated_savings(plan, analysis)
         
         # Sort recommendations by priority
-        plan.recommendations.sort(key=lambda x: x.priority.value, reverse=True)
+        plan.finalize()
         
         return plan
     
@@ -302,15 +354,14 @@ class FirewallRecommender:
     
     def _find_mergeable_rules(self, rules: List[FirewallRule]) -> List[List[FirewallRule]]:
         """Find groups of rules that could potentially be merged"""
+        candidates = [rule for rule in rules if rule.target in ["ACCEPT", "DROP", "REJECT"]]
+        
         groups = []
         
         # Group rules by similar patterns
         pattern_groups = {}
         
-        for rule in rules:
-            if rule.target not in ["ACCEPT", "DROP", "REJECT"]:
-                continue
-            
+        for rule in candidates:
             # Create a pattern key based on protocol, target, and other criteria
             pattern = (
                 rule.protocol,
@@ -341,41 +392,39 @@ class FirewallRecommender:
     
     def _check_default_policies(self, config: FirewallConfig, plan: OptimizationPlan):
         """Check for and recommend default policy improvements"""
+        missing = config.chains_missing_default_drop
+        if missing is None:
+            missing = config.find_chains_missing_default_drop()
         
-        for table_name, chains in config.tables.items():
-            if table_name == "filter":
-                for chain_name in ["INPUT", "FORWARD", "OUTPUT"]:
-                    if chain_name in chains:
-                        rules = chains[chain_name]
-                        
-                        # Check if there's an explicit default DROP at the end
-                        if rules:
-                            last_rule = rules[-1]
-                            if (last_rule.target != "DROP" or 
-                                last_rule.protocol or 
-                                last_rule.source_ip or 
-                                last_rule.destination_ip):
-                                
-                                # Suggest adding explicit default policy
-                                new_rule = FirewallRule(
-                                    table=table_name,
-                                    chain=chain_name,
-                                    target="DROP",
-                                    raw_rule=f"-A {chain_name} -j DROP"
-                                )
-                                
-                                recommendation = Recommendation(
-                                    rec_type=RecommendationType.ADD_RULE,
-                                    priority=RecommendationPriority.MEDIUM,
-                                    title=f"Add explicit default DROP policy to {chain_name}",
-                                    description="Add an explicit default DROP rule at the end of the chain for better security.",
-                                    affected_rules=[],
-                                    new_rules=[new_rule],
-                                    risk_level="medium",
-                                    estimated_impact="Improved security posture with explicit default policy",
-                                    implementation_notes=f"Add rule: -A {chain_name} -j DROP"
-                                )
-                                plan.add_recommendation(recommendation)
+        # Common case: every built-in chain already ends with a default DROP
+        if not missing:
+            return
+        
+        table_name = "filter"
+        for chain_name in ["INPUT", "FORWARD", "OUTPUT"]:
+            if (table_name, chain_name) not in missing:
+                continue
+            
+            # Suggest adding explicit default policy
+            new_rule = FirewallRule(
+                table=table_name,
+                chain=chain_name,
+                target="DROP",
+                raw_rule=f"-A {chain_name} -j DROP"
+            )
+            
+            recommendation = Recommendation(
+                rec_type=RecommendationType.ADD_RULE,
+                priority=RecommendationPriority.MEDIUM,
+                title=f"Add explicit default DROP policy to {chain_name}",
+                description="Add an explicit default DROP rule at the end of the chain for better security.",
+                affected_rules=[],
+                new_rules=[new_rule],
+                risk_level="medium",
+                estimated_impact="Improved security posture with explicit default policy",
+                implementation_notes=f"Add rule: -A {chain_name} -j DROP"
+            )
+            plan.add_recommendation(recommendation)
     
     def _calculate_estimated_savings(self, plan: OptimizationPlan, 
                                    analysis: AnalysisResult) -> Dict[str, float]:
@@ -387,9 +436,7 @@ class FirewallRecommender:
         }
         
         # Count rules that would be removed
-        for rec in plan.recommendations:
-            if rec.rec_type == RecommendationType.DELETE_RULE:
-                savings['rules_reduced'] += len(rec.affected_rules)
+        savings['rules_reduced'] = plan.deleted_rule_count
         
         # Estimate performance improvement (rough calculation)
         total_rules = analysis.statistics.get('total_rules', 1)
@@ -397,11 +444,9 @@ class FirewallRecommender:
             savings['performance_improvement'] = (savings['rules_reduced'] / total_rules) * 100
         
         # Estimate security improvement based on security recommendations
-        security_recs = len([rec for rec in plan.recommendations 
-                           if rec.rec_type in [RecommendationType.RESTRICT_SOURCE, 
-                                             RecommendationType.ADD_LOGGING]])
+        security_recs = plan.security_rec_count
         
-        security_issues = len(analysis.get_issues_by_type(IssueType.SECURITY_RISK))
+        security_issues = len(analysis.issues_by_type.get(IssueType.SECURITY_RISK, ()))
         if security_issues > 0:
             savings['security_improvement'] = (security_recs / security_issues) * 100
         
@@ -423,27 +468,42 @@ class FirewallRecommender:
         optimized_config = copy.deepcopy(original_config)
         
         # Apply recommendations in order of priority
-        sorted_recs = sorted(plan.recommendations, 
-                           key=lambda x: x.priority.value, reverse=True)
+        if plan.finalized:
+            sorted_recs = plan.recommendations
+        else:
+            sorted_recs = sorted(plan.recommendations, 
+                               key=attrgetter('priority.value'), reverse=True)
         
+        # Group deletions by chain so every chain is filtered in a single pass
+        to_delete: Dict[Tuple[str, str], Set[int]] = defaultdict(set)
         for rec in sorted_recs:
             if rec.rec_type == RecommendationType.DELETE_RULE:
-                self._apply_delete_recommendation(optimized_config, rec)
-            elif rec.rec_type == RecommendationType.ADD_RULE:
+                for rule in rec.affected_rules:
+                    to_delete[(rule.table, rule.chain)].add(rule.line_number)
+        
+        self._apply_delete_recommendations(optimized_config, to_delete)
+        
+        for rec in sorted_recs:
+            if rec.rec_type == RecommendationType.ADD_RULE:
                 self._apply_add_recommendation(optimized_config, rec)
             # Add more recommendation types as needed
         
+        # Chains were modified, so the parse-time default DROP check and
+        # rule count are stale
+        optimized_config.chains_missing_default_drop = None
+        optimized_config.count_rules()
+        
         return optimized_config
     
-    def _apply_delete_recommendation(self, config: FirewallConfig, rec: Recommendation):
-        """Apply a delete rule recommendation"""
-        for rule in rec.affected_rules:
-            # Find and remove the rule from the configuration
-            for table_name, chains in config.tables.items():
-                for chain_name, rules in chains.items():
-                    if rule in rules:
-                        rules.remove(rule)
-                        break
+    def _apply_delete_recommendations(self, config: FirewallConfig,
+                                      to_delete: Dict[Tuple[str, str], Set[int]]):
+        """Remove rules, given as line numbers grouped by (table, chain)"""
+        for (table_name, chain_name), line_numbers in to_delete.items():
+            rules = config.tables.get(table_name, {}).get(chain_name)
+            if rules:
+                config.tables[table_name][chain_name] = [
+                    rule for rule in rules if rule.line_number not in line_numbers
+                ]
     
     def _apply_add_recommendation(self, config: FirewallConfig, rec: Recommendation):
         """Apply an add rule recommendation"""
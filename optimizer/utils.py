@@ -7,33 +7,147 @@ common helper functions.
 """
 
 import os
+import importlib.util
+import atexit
 import json
+import dataclasses
+import ipaddress
+import re
 import logging
 import datetime
-import subprocess
-import shutil
+import time
 from typing import Dict, List, Optional, Tuple, Any, Union
 from pathlib import Path
-import hashlib
-import tempfile
+from queue import SimpleQueue
 from contextlib import contextmanager
+from functools import lru_cache
+from operator import attrgetter
+from concurrent.futures import ThreadPoolExecutor
 
-# Try to import yaml with fallback
+# Check for yaml without importing it; ConfigManager loads it on first use
+HAS_YAML = importlib.util.find_spec('yaml') is not None
+if not HAS_YAML:
+    print("Warning: PyYAML not installed. Configuration files will use JSON format.")
+
+# Try to import orjson for faster backup serialization
 try:
-    import yaml
-    HAS_YAML = True
+    import orjson
+    HAS_ORJSON = True
 except ImportError:
-    HAS_YAML = False
-    print("Warning: PyYAML not installed. Configuration files will use JSON format.")
+    HAS_ORJSON = False
+
+# Try to import ormsgpack for compact binary backups
+try:
+    import ormsgpack
+    HAS_ORMSGPACK = True
+except ImportError:
+    HAS_ORMSGPACK = False
 
 from .parser import FirewallConfig, FirewallRule
 
+# Shared by BackupManager and SystemInterface instances
+_LOG = logging.getLogger(__name__)
+
+# Resolved once for the cached validators below
+_ip_network = ipaddress.ip_network
+_PORT_RE = re.compile(r'^(\d+)(?::(\d+))?$')
+
+# Backups are written as msgpack when ormsgpack is installed; JSON backups
+# are always readable
+_BACKUP_SUFFIXES = ('.json', '.msgpack')
+
+# Backup count above which list_backups reads files on worker threads;
+# below it, starting the threads costs more than the reads
+_PARALLEL_BACKUP_READS = 32
+
+_SIZE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB')
+
+# FirewallRule field names pre-encoded for the stdlib JSON backup writer
+_RULE_FIELDS_JSON = tuple(
+    (json.dumps(field.name).encode('utf-8') + b': ', attrgetter(field.name))
+    for field in dataclasses.fields(FirewallRule)
+)
+
+
+def _json_dumps(data: Any) -> bytes:
+    """
+    Serialize data to compact JSON bytes, using orjson when available
+    
+    Dataclasses such as FirewallRule are serialized field by field without
+    building an intermediate dictionary when orjson is installed.
+    """
+    if HAS_ORJSON:
+        return orjson.dumps(data)
+    return json.dumps(data, default=_json_default).encode('utf-8')
+
+
+def _json_default(obj: Any) -> Any:
+    """Fallback encoder for objects the stdlib json module cannot serialize"""
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return dataclasses.asdict(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _json_loads(data: bytes) -> Any:
+    """Deserialize JSON bytes, using orjson when available"""
+    if HAS_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _encode_rule_json(rule: FirewallRule) -> bytes:
+    """Serialize a FirewallRule to JSON bytes with the stdlib encoder"""
+    # Only the values go through json.dumps; no intermediate dict is built
+    return b'{' + b', '.join(
+        key + json.dumps(getter(rule)).encode('utf-8')
+        for key, getter in _RULE_FIELDS_JSON
+    ) + b'}'
+
+
+def _msgpack_map_header(size: int) -> bytes:
+    """Encode a msgpack map header for a map with size entries"""
+    if size < 16:
+        return bytes((0x80 | size,))
+    if size < 0x10000:
+        return b'\xde' + size.to_bytes(2, 'big')
+    return b'\xdf' + size.to_bytes(4, 'big')
+
+
+def _msgpack_array_header(size: int) -> bytes:
+    """Encode a msgpack array header for an array with size items"""
+    if size < 16:
+        return bytes((0x90 | size,))
+    if size < 0x10000:
+        return b'\xdc' + size.to_bytes(2, 'big')
+    return b'\xdd' + size.to_bytes(4, 'big')
+
+
+def _load_backup_file(backup_file: Path) -> Dict[str, Any]:
+    """Load a backup file in either msgpack or JSON format"""
+    data = backup_file.read_bytes()
+    if backup_file.suffix == '.msgpack':
+        if not HAS_ORMSGPACK:
+            raise RuntimeError("ormsgpack is required to read msgpack backups")
+        return ormsgpack.unpackb(data)
+    return _json_loads(data)
+
 
 class ConfigManager:
     """
     Configuration manager for the firewall optimizer application
     """
     
+    # yaml module, imported the first time a YAML config is read or written
+    _yaml = None
+    
+    @classmethod
+    def _get_yaml(cls):
+        """Return the yaml module, importing it on first use"""
+        if cls._yaml is None:
+            import yaml
+            cls._yaml = yaml
+        return cls._yaml
+    
     def __init__(self, config_file: Optional[str] = None):
         if config_file:
             self.config_file = config_file
@@ -41,9 +155,28 @@ class ConfigManager:
             # Use YAML if available, otherwise JSON
             self.config_file = "optimizer_config.yaml" if HAS_YAML else "optimizer_config.json"
         
+        # Every value in the config keyed by its dotted path, kept in sync
+        # with self.config so get() is a single dict lookup
+        self._flat: Dict[str, Any] = {}
+        self._split_cache: Dict[str, Tuple[str, ...]] = {}
+        
+        # Background logging listener started by setup_logging, and the
+        # root logger handler that feeds it
+        self.log_listener = None
+        self.log_queue_handler = None
+        
         self.config = self._load_default_config()
         self._load_config()
     
+    def shutdown(self):
+        """Stop the background logging listener, flushing queued records"""
+        if self.log_queue_handler is not None:
+            logging.getLogger().removeHandler(self.log_queue_handler)
+            self.log_queue_handler = None
+        if self.log_listener is not None:
+            self.log_listener.stop()
+            self.log_listener = None
+    
     def _load_default_config(self) -> Dict[str, Any]:
         """Load default configuration settings"""
         return {
@@ -90,7 +223,7 @@ class ConfigManager:
             try:
                 with open(self.config_file, 'r') as f:
                     if HAS_YAML and self.config_file.endswith('.yaml'):
-                        user_config = yaml.safe_load(f)
+                        user_config = self._get_yaml().safe_load(f)
                     else:
                         # Fall back to JSON
                         user_config = json.load(f)
@@ -99,21 +232,27 @@ class ConfigManager:
                         self._deep_update(self.config, user_config)
             except Exception as e:
                 logging.warning(f"Failed to load config file {self.config_file}: {e}")
+        
+        self._rebuild_flat()
     
     def _deep_update(self, base_dict: Dict, update_dict: Dict):
         """Deep update of nested dictionaries"""
-        for key, value in update_dict.items():
-            if key in base_dict and isinstance(base_dict[key], dict) and isinstance(value, dict):
-                self._deep_update(base_dict[key], value)
-            else:
-                base_dict[key] = value
+        # Walk nested levels with an explicit stack instead of recursing
+        stack = [(base_dict, update_dict)]
+        while stack:
+            base, update = stack.pop()
+            for key, value in update.items():
+                if isinstance(value, dict) and isinstance(base.get(key), dict):
+                    stack.append((base[key], value))
+                else:
+                    base[key] = value
     
     def save_config(self):
         """Save current configuration to file"""
         try:
             with open(self.config_file, 'w') as f:
                 if HAS_YAML and self.config_file.endswith('.yaml'):
-                    yaml.dump(self.config, f, default_flow_style=False, indent=2)
+                    self._get_yaml().dump(self.config, f, default_flow_style=False, indent=2)
                 else:
                     # Fall back to JSON
                     json.dump(self.config, f, indent=2)
@@ -131,16 +270,7 @@ class ConfigManager:
         Returns:
             Configuration value or default
         """
-        keys = key_path.split('.')
-        value = self.config
-        
-        for key in keys:
-            if isinstance(value, dict) and key in value:
-                value = value[key]
-            else:
-                return default
-        
-        return value
+        return self._flat.get(key_path, default)
     
     def set(self, key_path: str, value: Any):
         """
@@ -150,15 +280,44 @@ class ConfigManager:
             key_path: Path to config value (e.g., 'backup.enabled')
             value: Value to set
         """
-        keys = key_path.split('.')
+        keys = self._split_key_path(key_path)
         config = self.config
         
-        for key in keys[:-1]:
+        for depth, key in enumerate(keys[:-1], 1):
             if key not in config:
                 config[key] = {}
+                self._flat['.'.join(keys[:depth])] = config[key]
             config = config[key]
         
         config[keys[-1]] = value
+        
+        # Drop paths below the old value before recording the new one
+        prefix = key_path + '.'
+        for stale_path in [path for path in self._flat if path.startswith(prefix)]:
+            del self._flat[stale_path]
+        self._flatten(key_path, value)
+    
+    def _rebuild_flat(self):
+        """Recompute the dotted-path index from self.config"""
+        self._flat.clear()
+        for key, value in self.config.items():
+            self._flatten(key, value)
+    
+    def _flatten(self, key_path: str, value: Any):
+        """Index value and everything nested below it under key_path"""
+        stack = [(key_path, value)]
+        while stack:
+            path, item = stack.pop()
+            self._flat[path] = item
+            if isinstance(item, dict):
+                stack.extend((f"{path}.{key}", child) for key, child in item.items())
+    
+    def _split_key_path(self, key_path: str) -> Tuple[str, ...]:
+        """Split a dotted key path, caching the result per distinct path"""
+        keys = self._split_cache.get(key_path)
+        if keys is None:
+            keys = self._split_cache[key_path] = tuple(key_path.split('.'))
+        return keys
 
 
 class BackupManager:
@@ -169,10 +328,10 @@ class BackupManager:
     def __init__(self, backup_dir: str = "./backups"):
         self.backup_dir = Path(backup_dir)
         self.backup_dir.mkdir(exist_ok=True)
-        self.logger = logging.getLogger(__name__)
+        self.logger = _LOG
     
     def create_backup(self, config: FirewallConfig, 
-                     description: str = "") -> str:
+                     description: str = "") -> Tuple[str, bool]:
         """
         Create a backup of the firewall configuration
         
@@ -181,60 +340,93 @@ class BackupManager:
             description: Optional description for the backup
             
         Returns:
-            Path to the created backup file
+            Tuple of (backup path, created). When the most recent backup
+            already holds an identical configuration no file is written,
+            created is False and the path is that backup's
         """
+        config_hash = self._calculate_config_hash(config)
+        
+        latest = self._latest_backup_meta()
+        if latest and latest['config_hash'] == config_hash:
+            self.logger.info(f"No changes since {latest['path']}, skipping backup")
+            return latest['path'], False
+        
         timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-        backup_filename = f"firewall_backup_{timestamp}.json"
+        suffix = '.msgpack' if HAS_ORMSGPACK else '.json'
+        backup_filename = f"firewall_backup_{timestamp}{suffix}"
         backup_path = self.backup_dir / backup_filename
         
-        backup_data = {
+        header = {
             'timestamp': timestamp,
             'description': description,
-            'config_hash': self._calculate_config_hash(config),
-            'tables': {}
+            'config_hash': config_hash
         }
         
-        # Convert config to serializable format
-        for table_name, chains in config.tables.items():
-            backup_data['tables'][table_name] = {}
-            for chain_name, rules in chains.items():
-                backup_data['tables'][table_name][chain_name] = [
-                    {
-                        'raw_rule': rule.raw_rule,
-                        'line_number': rule.line_number,
-                        'table': rule.table,
-                        'chain': rule.chain,
-                        'target': rule.target,
-                        'protocol': rule.protocol,
-                        'source_ip': rule.source_ip,
-                        'destination_ip': rule.destination_ip,
-                        'source_port': rule.source_port,
-                        'destination_port': rule.destination_port,
-                        'interface_in': rule.interface_in,
-                        'interface_out': rule.interface_out,
-                        'state': rule.state,
-                        'module': rule.module,
-                        'parameters': rule.parameters
-                    }
-                    for rule in rules
-                ]
-        
-        # Save backup
+        # Stream the backup to disk one rule at a time instead of building
+        # the whole document in memory first
         try:
-            with open(backup_path, 'w') as f:
-                json.dump(backup_data, f, indent=2)
+            with open(backup_path, 'wb') as f:
+                if HAS_ORMSGPACK:
+                    self._write_msgpack_backup(f, header, config)
+                else:
+                    self._write_json_backup(f, header, config)
             
             self.logger.info(f"Backup created: {backup_path}")
             
             # Clean up old backups
             self._cleanup_old_backups()
             
-            return str(backup_path)
+            return str(backup_path), True
         
         except Exception as e:
             self.logger.error(f"Failed to create backup: {e}")
             raise
     
+    def _write_json_backup(self, f, header: Dict[str, Any], config: FirewallConfig):
+        """Write a backup document as JSON"""
+        encode_rule = _json_dumps if HAS_ORJSON else _encode_rule_json
+        
+        f.write(_json_dumps(header)[:-1] + b', "tables": {')
+        
+        for table_index, (table_name, chains) in enumerate(config.tables.items()):
+            if table_index:
+                f.write(b',')
+            f.write(b'\n' + _json_dumps(table_name) + b': {')
+            
+            for chain_index, (chain_name, rules) in enumerate(chains.items()):
+                if chain_index:
+                    f.write(b',')
+                f.write(b'\n' + _json_dumps(chain_name) + b': [')
+                
+                for rule_index, rule in enumerate(rules):
+                    if rule_index:
+                        f.write(b',')
+                    f.write(b'\n' + encode_rule(rule))
+                
+                f.write(b']')
+            
+            f.write(b'}')
+        
+        f.write(b'}}\n')
+    
+    def _write_msgpack_backup(self, f, header: Dict[str, Any], config: FirewallConfig):
+        """Write a backup document as msgpack"""
+        # Container headers carry their sizes up front, so the document can
+        # still be written incrementally
+        f.write(_msgpack_map_header(len(header) + 1))
+        for key, value in header.items():
+            f.write(ormsgpack.packb(key) + ormsgpack.packb(value))
+        
+        f.write(ormsgpack.packb('tables') + _msgpack_map_header(len(config.tables)))
+        for table_name, chains in config.tables.items():
+            f.write(ormsgpack.packb(table_name) + _msgpack_map_header(len(chains)))
+            
+            for chain_name, rules in chains.items():
+                f.write(ormsgpack.packb(chain_name) + _msgpack_array_header(len(rules)))
+                
+                for rule in rules:
+                    f.write(ormsgpack.packb(rule))
+    
     def list_backups(self) -> List[Dict[str, Any]]:
         """
         List all available backups
@@ -242,29 +434,69 @@ class BackupManager:
         Returns:
             List of backup information dictionaries
         """
-        backups = []
-        
-        for backup_file in self.backup_dir.glob("firewall_backup_*.json"):
-            try:
-                with open(backup_file, 'r') as f:
-                    backup_data = json.load(f)
-                
-                backups.append({
-                    'filename': backup_file.name,
-                    'path': str(backup_file),
-                    'timestamp': backup_data.get('timestamp', 'unknown'),
-                    'description': backup_data.get('description', ''),
-                    'size': backup_file.stat().st_size,
-                    'config_hash': backup_data.get('config_hash', '')
-                })
-            
-            except Exception as e:
-                self.logger.warning(f"Failed to read backup {backup_file}: {e}")
+        backup_files = [path for path in self.backup_dir.glob("firewall_backup_*")
+                        if path.suffix in _BACKUP_SUFFIXES]
+        if not backup_files:
+            return []
+        
+        # Backup files are independent, so many of them are read and parsed
+        # concurrently
+        if len(backup_files) > _PARALLEL_BACKUP_READS:
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                infos = list(executor.map(self._read_backup_info, backup_files))
+        else:
+            infos = map(self._read_backup_info, backup_files)
+        backups = [info for info in infos if info is not None]
         
         # Sort by timestamp descending
         backups.sort(key=lambda x: x['timestamp'], reverse=True)
         return backups
     
+    def _read_backup_info(self, backup_file: Path) -> Optional[Dict[str, Any]]:
+        """Read summary information for a single backup file"""
+        try:
+            backup_data = _load_backup_file(backup_file)
+            
+            return {
+                'filename': backup_file.name,
+                'path': str(backup_file),
+                'timestamp': backup_data.get('timestamp', 'unknown'),
+                'description': backup_data.get('description', ''),
+                'size': backup_file.stat().st_size,
+                'config_hash': backup_data.get('config_hash', '')
+            }
+        
+        except Exception as e:
+            self.logger.warning(f"Failed to read backup {backup_file}: {e}")
+            return None
+    
+    def _scan_backups(self) -> List[os.DirEntry]:
+        """List backup files in the backup directory"""
+        # DirEntry.stat() reuses data from the directory scan where possible
+        with os.scandir(self.backup_dir) as it:
+            return [entry for entry in it
+                    if entry.name.startswith('firewall_backup_')
+                    and entry.name.endswith(_BACKUP_SUFFIXES)]
+    
+    def _latest_backup_meta(self) -> Optional[Dict[str, Any]]:
+        """Return path and config hash of the most recently written backup"""
+        backups = self._scan_backups()
+        
+        if not backups:
+            return None
+        
+        newest = max(backups, key=lambda entry: entry.stat().st_mtime)
+        try:
+            backup_data = _load_backup_file(Path(newest.path))
+        except Exception as e:
+            self.logger.warning(f"Failed to read backup {newest.path}: {e}")
+            return None
+        
+        return {
+            'path': newest.path,
+            'config_hash': backup_data.get('config_hash', '')
+        }
+    
     def restore_backup(self, backup_path: str) -> FirewallConfig:
         """
         Restore a firewall configuration from backup
@@ -278,8 +510,7 @@ class BackupManager:
         from .parser import FirewallRule, FirewallConfig, ChainInfo, ChainPolicy
         
         try:
-            with open(backup_path, 'r') as f:
-                backup_data = json.load(f)
+            backup_data = _load_backup_file(Path(backup_path))
             
             config = FirewallConfig()
             
@@ -311,6 +542,7 @@ class BackupManager:
                         rules.append(rule)
                     
                     config.tables[table_name][chain_name] = rules
+                    config.rule_count += len(rules)
             
             self.logger.info(f"Configuration restored from backup: {backup_path}")
             return config
@@ -321,29 +553,36 @@ class BackupManager:
     
     def _calculate_config_hash(self, config: FirewallConfig) -> str:
         """Calculate hash of configuration for integrity checking"""
-        config_str = ""
+        import hashlib
+        
+        # Gather everything into one buffer so sha256 runs as a single C call.
+        # Table and chain names are included and every field is NUL-terminated,
+        # so moving a rule between chains or splitting one changes the hash.
+        buffer = bytearray()
         
         for table_name, chains in config.tables.items():
+            buffer += b'*' + table_name.encode() + b'\0'
             for chain_name, rules in chains.items():
+                buffer += b':' + chain_name.encode() + b'\0'
                 for rule in rules:
-                    config_str += rule.raw_rule
+                    buffer += rule.raw_rule.encode() + b'\0'
         
-        return hashlib.sha256(config_str.encode()).hexdigest()[:16]
+        return hashlib.sha256(memoryview(buffer)).hexdigest()[:16]
     
     def _cleanup_old_backups(self, max_backups: int = 10):
         """Clean up old backup files"""
-        backups = list(self.backup_dir.glob("firewall_backup_*.json"))
+        backups = self._scan_backups()
         
         if len(backups) > max_backups:
             # Sort by modification time and remove oldest
-            backups.sort(key=lambda x: x.stat().st_mtime)
+            backups.sort(key=lambda entry: entry.stat().st_mtime)
             
             for old_backup in backups[:-max_backups]:
                 try:
-                    old_backup.unlink()
-                    self.logger.info(f"Removed old backup: {old_backup}")
+                    os.unlink(old_backup.path)
+                    self.logger.info(f"Removed old backup: {old_backup.path}")
                 except Exception as e:
-                    self.logger.warning(f"Failed to remove old backup {old_backup}: {e}")
+                    self.logger.warning(f"Failed to remove old backup {old_backup.path}: {e}")
 
 
 class SystemInterface:
@@ -351,17 +590,37 @@ class SystemInterface:
     Interface for interacting with the system firewall
     """
     
-    def __init__(self, dry_run: bool = True):
+    def __init__(self, dry_run: bool = True, cache_ttl: float = 2.0,
+                 command_timeout: float = 30.0):
         self.dry_run = dry_run
-        self.logger = logging.getLogger(__name__)
+        self.cache_ttl = cache_ttl
+        # Seconds to wait for iptables-save before giving up on it
+        self.command_timeout = command_timeout
+        self.logger = _LOG
+        # (monotonic timestamp, iptables-save output) of the last successful read
+        self._rules_cache: Optional[Tuple[float, str]] = None
+    
+    def invalidate_cache(self):
+        """Discard cached iptables-save output"""
+        self._rules_cache = None
     
     def get_current_rules(self) -> str:
         """
         Get current iptables rules using iptables-save
         
+        Output is cached for cache_ttl seconds to avoid spawning
+        iptables-save on every call.
+        
         Returns:
             String output from iptables-save
         """
+        import subprocess
+        
+        if self._rules_cache is not None:
+            cached_at, cached_rules = self._rules_cache
+            if time.monotonic() - cached_at < self.cache_ttl:
+                return cached_rules
+        
         try:
             if os.name == 'nt':  # Windows
                 self.logger.warning("iptables not available on Windows. Using sample data.")
@@ -371,11 +630,13 @@ class SystemInterface:
                 ['iptables-save'],
                 capture_output=True,
                 text=True,
-                check=True
+                check=True,
+                timeout=self.command_timeout
             )
+            self._rules_cache = (time.monotonic(), result.stdout)
             return result.stdout
         
-        except subprocess.CalledProcessError as e:
+        except (subprocess.CalledProcessError, subprocess.TimeoutExpired) as e:
             self.logger.error(f"Failed to get current rules: {e}")
             return self._get_sample_rules()
         except FileNotFoundError:
@@ -397,31 +658,25 @@ class SystemInterface:
             self.logger.info(rules_content)
             return True
         
+        import subprocess
+        
         try:
             if os.name == 'nt':  # Windows
                 self.logger.warning("Cannot apply iptables rules on Windows")
                 return False
             
-            # Create temporary file for rules
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.rules', delete=False) as f:
-                f.write(rules_content)
-                temp_file = f.name
-            
-            try:
-                # Apply rules
-                result = subprocess.run(
-                    ['iptables-restore', temp_file],
-                    capture_output=True,
-                    text=True,
-                    check=True
-                )
-                
-                self.logger.info("Rules applied successfully")
-                return True
+            # iptables-restore reads the ruleset from stdin
+            subprocess.run(
+                ['iptables-restore'],
+                input=rules_content,
+                capture_output=True,
+                text=True,
+                check=True
+            )
             
-            finally:
-                # Clean up temporary file
-                os.unlink(temp_file)
+            self.invalidate_cache()
+            self.logger.info("Rules applied successfully")
+            return True
         
         except subprocess.CalledProcessError as e:
             self.logger.error(f"Failed to apply rules: {e}")
@@ -454,22 +709,16 @@ class SystemInterface:
                             errors.append(f"Line {i}: Invalid rule format: {line}")
             else:
                 # Use iptables-restore --test on Linux
-                with tempfile.NamedTemporaryFile(mode='w', suffix='.rules', delete=False) as f:
-                    f.write(rules_content)
-                    temp_file = f.name
-                
-                try:
-                    result = subprocess.run(
-                        ['iptables-restore', '--test', temp_file],
-                        capture_output=True,
-                        text=True
-                    )
-                    
-                    if result.returncode != 0:
-                        errors.append(f"Validation failed: {result.stderr}")
+                import subprocess
+                result = subprocess.run(
+                    ['iptables-restore', '--test'],
+                    input=rules_content,
+                    capture_output=True,
+                    text=True
+                )
                 
-                finally:
-                    os.unlink(temp_file)
+                if result.returncode != 0:
+                    errors.append(f"Validation failed: {result.stderr}")
         
         except Exception as e:
             errors.append(f"Validation error: {e}")
@@ -510,7 +759,7 @@ def setup_logging(config: ConfigManager):
     )
     
     # Setup file handler with rotation
-    from logging.handlers import RotatingFileHandler
+    from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
     file_handler = RotatingFileHandler(
         log_file,
         maxBytes=config.get('logging.max_size_mb', 10) * 1024 * 1024,
@@ -522,11 +771,23 @@ def setup_logging(config: ConfigManager):
     console_handler = logging.StreamHandler()
     console_handler.setFormatter(formatter)
     
+    # Formatting and disk I/O happen on the listener thread; callers only
+    # enqueue records
+    config.shutdown()
+    log_queue = SimpleQueue()
+    config.log_listener = QueueListener(
+        log_queue, file_handler, console_handler, respect_handler_level=True
+    )
+    config.log_listener.start()
+    # Register once even when logging is set up again
+    atexit.unregister(config.shutdown)
+    atexit.register(config.shutdown)
+    
     # Configure root logger
     root_logger = logging.getLogger()
     root_logger.setLevel(log_level)
-    root_logger.addHandler(file_handler)
-    root_logger.addHandler(console_handler)
+    config.log_queue_handler = QueueHandler(log_queue)
+    root_logger.addHandler(config.log_queue_handler)
 
 
 @contextmanager
@@ -538,12 +799,15 @@ def safe_file_operation(file_path: str, backup: bool = True):
         file_path: Path to file to operate on
         backup: Whether to create backup before operation
     """
+    import shutil
+    
     backup_path = None
     
     try:
         if backup and os.path.exists(file_path):
             backup_path = f"{file_path}.backup.{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}"
-            shutil.copy2(file_path, backup_path)
+            # Contents only; the backup is removed once the operation succeeds
+            shutil.copyfile(file_path, backup_path)
         
         yield file_path
     
@@ -576,13 +840,16 @@ def format_size(size_bytes: int) -> str:
     Returns:
         Formatted size string
     """
-    for unit in ['B', 'KB', 'MB', 'GB']:
-        if size_bytes < 1024.0:
-            return f"{size_bytes:.1f} {unit}"
-        size_bytes /= 1024.0
-    return f"{size_bytes:.1f} TB"
+    # Each unit is 2**10 times the previous one, so the bit length of the
+    # size picks the unit directly
+    if size_bytes < 1024:
+        index = 0
+    else:
+        index = min(int(size_bytes).bit_length() - 1, 49) // 10
+    return f"{size_bytes / (1 << (10 * index)):.1f} {_SIZE_UNITS[index]}"
 
 
+@lru_cache(maxsize=4096)
 def validate_ip_address(ip_str: str) -> bool:
     """
     Validate IP address or network notation
@@ -594,13 +861,13 @@ def validate_ip_address(ip_str: str) -> bool:
         True if valid, False otherwise
     """
     try:
-        import ipaddress
-        ipaddress.ip_network(ip_str, strict=False)
+        _ip_network(ip_str, strict=False)
         return True
     except ValueError:
         return False
 
 
+@lru_cache(maxsize=4096)
 def validate_port(port_str: str) -> bool:
     """
     Validate port number or range
@@ -611,19 +878,18 @@ def validate_port(port_str: str) -> bool:
     Returns:
         True if valid, False otherwise
     """
-    try:
-        if ':' in port_str:
-            # Port range
-            start, end = port_str.split(':', 1)
-            return (1 <= int(start) <= 65535 and 
-                   1 <= int(end) <= 65535 and 
-                   int(start) <= int(end))
-        else:
-            # Single port
-            port = int(port_str)
-            return 1 <= port <= 65535
-    except ValueError:
+    match = _PORT_RE.match(port_str)
+    if not match:
         return False
+    
+    start = int(match.group(1))
+    if match.group(2) is None:
+        # Single port
+        return 1 <= start <= 65535
+    
+    # Port range
+    end = int(match.group(2))
+    return 1 <= start <= end <= 65535
 
 
 def main():
@@ -6,14 +6,23 @@ including rule flow diagrams, dependency graphs, performance heatmaps, and
 security analysis charts.
 """
 
+import os
+import importlib.util
 import logging
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from types import MappingProxyType
+from operator import attrgetter
 from typing import Dict, List, Tuple, Optional, Any
-from collections import defaultdict, Counter
+from collections import defaultdict
+from functools import lru_cache
 
 # Optional visualization imports
 try:
     import matplotlib.pyplot as plt
     import matplotlib.patches as patches
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
     MATPLOTLIB_AVAILABLE = True
 except ImportError:
     # Create mock plt for type annotations
@@ -25,7 +34,9 @@ except ImportError:
 try:
     import plotly.graph_objects as go
     import plotly.express as px
+    import plotly.io as pio
     from plotly.subplots import make_subplots
+    from plotly.offline import get_plotlyjs_version
     PLOTLY_AVAILABLE = True
 except ImportError:
     PLOTLY_AVAILABLE = False
@@ -54,16 +65,279 @@ try:
 except ImportError:
     SEABORN_AVAILABLE = False
 
+try:
+    from PIL import Image
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
+# Optional JIT acceleration for counting very large rule sets; numba is
+# imported on first use since importing it is slow
+NUMBA_AVAILABLE = importlib.util.find_spec('numba') is not None
+
 from .parser import FirewallRule, FirewallConfig
 from .analyzer import AnalysisResult, IssueType, IssueSeverity
 from .recommender import OptimizationPlan, RecommendationType
 
+# Lower bounds of the 1-1023, 1024-49151 and 49152-65535 heatmap port ranges;
+# anything below the first bound falls into the '0' (any/invalid) range
+_PORT_RANGE_BINS = (1, 1024, 49152)
+_PORT_RANGE_LABELS = ('0', '1-1023', '1024-49151', '49152-65535')
+
+# Rule count above which the heatmap is counted with the JIT kernel
+HEATMAP_JIT_THRESHOLD = 100000
+
+
+def _hist3d(p_codes, r_codes, a_codes, n_p, n_r, n_a):
+    """
+    Count rules per (protocol, port range, action) code triple
+    
+    Args:
+        p_codes: int64 protocol code per rule
+        r_codes: int64 port range code per rule
+        a_codes: int64 action code per rule
+        n_p: Number of distinct protocols
+        n_r: Number of port ranges
+        n_a: Number of distinct actions
+        
+    Returns:
+        (n_p, n_r, n_a) int64 array of rule counts
+    """
+    out = np.zeros((n_p, n_r, n_a), np.int64)
+    for i in range(p_codes.shape[0]):
+        out[p_codes[i], r_codes[i], a_codes[i]] += 1
+    return out
+
+
+@lru_cache(maxsize=None)
+def _compiled_hist3d():
+    """_hist3d compiled with numba, which is imported on first use"""
+    from numba import njit
+    return njit(cache=True)(_hist3d)
+
+
+def _heatmap_pivot_jit(protocols: Any, range_codes: Any, actions: Any) -> Any:
+    """
+    Build the heatmap pivot table from a JIT-counted histogram
+    
+    Produces the same table as pd.crosstab: rows for each observed
+    (protocol, port range) pair in sorted order and a column per action.
+    """
+    p_codes, p_values = pd.factorize(protocols, sort=True)
+    a_codes, a_values = pd.factorize(actions, sort=True)
+    n_r = len(_PORT_RANGE_LABELS)
+    
+    cube = _compiled_hist3d()(p_codes.astype(np.int64), range_codes.astype(np.int64),
+                   a_codes.astype(np.int64), len(p_values), n_r, len(a_values))
+    
+    # Range labels sort in bucket order, so (protocol, range) row-major
+    # order matches crosstab's sorted index
+    counts = cube.reshape(-1, len(a_values))
+    observed = counts.sum(axis=1) > 0
+    rows = np.flatnonzero(observed)
+    index = pd.MultiIndex.from_arrays(
+        [np.asarray(p_values, dtype=object)[rows // n_r],
+         np.array(_PORT_RANGE_LABELS, dtype=object)[rows % n_r]],
+        names=['Protocol', 'PortRange']
+    )
+    columns = pd.Index(np.asarray(a_values, dtype=object), name='Action')
+    return pd.DataFrame(counts[observed], index=index, columns=columns)
+
+
+def _value_counts(values: Any, count: int) -> Tuple[Any, Any]:
+    """
+    Count distinct values with NumPy, keeping first-seen order like Counter
+    
+    Args:
+        values: Iterable of hashable, sortable values
+        count: Number of values the iterable yields
+        
+    Returns:
+        Tuple of (distinct values, counts) arrays
+    """
+    array = np.fromiter(values, dtype=object, count=count)
+    keys, first_index, counts = np.unique(array, return_index=True, return_counts=True)
+    order = np.argsort(first_index)
+    return keys[order], counts[order]
+
+
+_RULE_COLUMNS = ('target', 'protocol', 'source_ip', 'destination_port', 'jump_target')
+_get_rule_columns = attrgetter(*_RULE_COLUMNS)
+
+
+@dataclass
+class RuleSoA:
+    """
+    Column-oriented view of every rule in a FirewallConfig
+    
+    Each array holds one entry per rule in config order. The rules of a
+    chain occupy the slice [start:stop] recorded for it in ``chains``.
+    """
+    chains: Tuple[Tuple[str, str, int, int], ...]  # (table, chain, start, stop)
+    rules: List[FirewallRule]
+    table: Any
+    chain: Any
+    position: Any
+    target: Any
+    protocol: Any
+    source_ip: Any
+    destination_port: Any
+    jump_target: Any
+    port: Any  # numeric destination port; 0 when missing, a range or invalid
+
+
+def _is_empty(config: FirewallConfig) -> bool:
+    """Check whether a configuration has no rules, stopping at the first non-empty chain"""
+    return not any(rules for chains in config.tables.values() for rules in chains.values())
+
+
+def _rules_to_soa(config: FirewallConfig) -> RuleSoA:
+    """
+    Flatten all rules of a configuration into a RuleSoA
+    
+    Args:
+        config: FirewallConfig to flatten
+        
+    Returns:
+        RuleSoA with one entry per rule
+    """
+    chains = []
+    rules = []
+    for table_name, table_chains in config.tables.items():
+        for chain_name, chain_rules in table_chains.items():
+            chains.append((table_name, chain_name, len(rules), len(rules) + len(chain_rules)))
+            rules.extend(chain_rules)
+    
+    lengths = np.array([stop - start for _, _, start, stop in chains], dtype=np.int64)
+    starts = np.array([start for _, _, start, _ in chains], dtype=np.int64)
+    
+    columns = np.array([_get_rule_columns(rule) for rule in rules], dtype=object)
+    columns = columns.reshape(len(rules), len(_RULE_COLUMNS)).T.copy()
+    target, protocol, source_ip, destination_port, jump_target = columns
+    
+    # Non-numeric ports (ranges, names) coerce to NaN and end up as 0
+    port = pd.to_numeric(pd.Series(destination_port, dtype=object), errors='coerce')
+    port = port.to_numpy(dtype=np.float64, na_value=0.0)
+    port = np.where((port >= 0) & (port <= 65535), port, 0).astype(np.int32)
+    
+    return RuleSoA(
+        chains=tuple(chains),
+        rules=rules,
+        table=np.repeat(np.array([c[0] for c in chains], dtype=object), lengths),
+        chain=np.repeat(np.array([c[1] for c in chains], dtype=object), lengths),
+        position=np.arange(len(rules)) - np.repeat(starts, lengths),
+        target=target,
+        protocol=protocol,
+        source_ip=source_ip,
+        destination_port=destination_port,
+        jump_target=jump_target,
+        port=port
+    )
+
+
+class _LazyFig:
+    """Figure proxy that builds the wrapped figure on first attribute access"""
+    
+    __slots__ = ('_factory', '_fig')
+    
+    def __init__(self, factory):
+        self._factory = factory
+        self._fig = None
+    
+    def _build(self) -> Any:
+        """Build the figure if needed and return it"""
+        if self._fig is None:
+            self._fig = self._factory()
+            self._factory = None
+        return self._fig
+    
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._build(), name)
+
+
+def _subplot_specs(subplot_types: Tuple[Tuple[str, ...], ...]) -> List[List[Dict[str, str]]]:
+    """Build a fresh make_subplots specs grid; make_subplots fills its dicts in place"""
+    return [[{'type': subplot_type} for subplot_type in row] for row in subplot_types]
+
 
 class FirewallVisualizer:
     """
     Comprehensive visualization system for firewall rules and analysis results
     """
     
+    # Flow diagrams with more rules than this are drawn with WebGL markers
+    SCATTERGL_THRESHOLD = 2000
+    # Chains longer than this are drawn as one marker per run of equal targets
+    AGGREGATE_THRESHOLD = 20000
+    
+    # Static figure layouts, shared read-only across calls
+    _FLOW_DIAGRAM_LAYOUT = MappingProxyType({
+        'title': 'Firewall Rule Flow Diagram',
+        'xaxis_title': 'Chains',
+        'yaxis_title': 'Rule Position (Top to Bottom)',
+        'showlegend': True,
+        'height': 600,
+        'template': 'plotly_white'
+    })
+    
+    _DASHBOARD_SUBPLOT_TITLES = (
+        'Issues by Type',
+        'Issues by Severity',
+        'Rule Statistics',
+        'Security & Efficiency Scores'
+    )
+    _DASHBOARD_SUBPLOT_TYPES = (('bar', 'pie'), ('bar', 'indicator'))
+    _DASHBOARD_LAYOUT = MappingProxyType({
+        'title': 'Firewall Analysis Dashboard',
+        'height': 800,
+        'showlegend': False,
+        'template': 'plotly_white'
+    })
+    
+    # Score gauge bands and target line shared by the dashboard indicators
+    _GAUGE_STEPS = (
+        {'range': [0, 50], 'color': "lightgray"},
+        {'range': [50, 80], 'color': "yellow"},
+        {'range': [80, 100], 'color': "green"}
+    )
+    _GAUGE_THRESHOLD = MappingProxyType({
+        'line': {'color': "red", 'width': 4},
+        'thickness': 0.75,
+        'value': 90
+    })
+    
+    _DEPENDENCY_GRAPH_LAYOUT = MappingProxyType({
+        'title': {'text': 'Firewall Rule Dependency Graph', 'font': {'size': 16}},
+        'showlegend': False,
+        'hovermode': 'closest',
+        'margin': {'b': 20, 'l': 5, 'r': 5, 't': 40},
+        'annotations': ({
+            'text': "Chains and rule relationships",
+            'showarrow': False,
+            'xref': "paper", 'yref': "paper",
+            'x': 0.005, 'y': -0.002,
+            'xanchor': 'left', 'yanchor': 'bottom',
+            'font': {'color': "grey", 'size': 12}
+        },),
+        'xaxis': {'showgrid': False, 'zeroline': False, 'showticklabels': False},
+        'yaxis': {'showgrid': False, 'zeroline': False, 'showticklabels': False},
+        'template': 'plotly_white'
+    })
+    
+    _IMPACT_SUBPLOT_TITLES = (
+        'Recommendations by Type',
+        'Recommendations by Priority',
+        'Estimated Impact',
+        'Implementation Risk'
+    )
+    _IMPACT_SUBPLOT_TYPES = (('bar', 'bar'), ('bar', 'pie'))
+    _IMPACT_LAYOUT = MappingProxyType({
+        'title': 'Optimization Plan Impact Analysis',
+        'height': 800,
+        'showlegend': False,
+        'template': 'plotly_white'
+    })
+    
     def __init__(self, style: str = "seaborn-v0_8"):
         self.logger = logging.getLogger(__name__)
         
@@ -97,12 +371,97 @@ class FirewallVisualizer:
             'security': '#e74c3c',
             'optimization': '#27ae60'
         }
+        
+        # Marker colors for terminal rule targets; other targets use a
+        # per-chart default
+        self._target_color_lut = {
+            'ACCEPT': self.colors['accept'],
+            'DROP': self.colors['drop'],
+            'REJECT': self.colors['reject']
+        }
+        
+        # Named colors as a Series so whole label arrays can be colored with
+        # one reindex() instead of a dict lookup per element
+        self._color_series = pd.Series(self.colors, dtype=object) if PANDAS_AVAILABLE else None
+        
+        # RuleSoA per visualized config, keyed by id() and validated against
+        # a weak reference and the chain layout it was built from
+        self._soa_cache: Dict[int, Tuple[Any, Tuple, RuleSoA]] = {}
+    
+    def _write_html(self, fig: Any, path: str, standalone: bool = True):
+        """
+        Write a Plotly figure to HTML, loading plotly.js from the CDN
+        
+        The figure JSON (serialized with orjson when available) is written
+        straight into a minimal page instead of being spliced into
+        write_html's template string first.
+        
+        Args:
+            fig: Plotly figure to write
+            path: Output file path
+            standalone: Write a complete HTML page rather than a <div> fragment
+        """
+        # Escape '</' so strings in the figure cannot close the script tag
+        fig_json = pio.to_json(fig, validate=False).replace('</', '<\\/')
+        cdn_url = f"https://cdn.plot.ly/plotly-{get_plotlyjs_version()}.min.js"
+        
+        with open(path, 'w', encoding='utf-8') as f:
+            if standalone:
+                f.write('<!DOCTYPE html>\n<html>\n<head><meta charset="utf-8" /></head>\n<body>\n')
+            f.write(f'<script charset="utf-8" src="{cdn_url}"></script>\n'
+                    '<div id="plotly-figure" class="plotly-graph-div" '
+                    'style="height:100%; width:100%;"></div>\n'
+                    '<script type="text/javascript">\nvar figure = ')
+            f.write(fig_json)
+            f.write(';\nPlotly.newPlot("plotly-figure", figure.data, figure.layout, '
+                    '{"responsive": true});\n</script>\n')
+            if standalone:
+                f.write('</body>\n</html>\n')
+    
+    def _target_colors(self, targets: Any, default: str) -> Any:
+        """Map an array of rule targets to marker colors in one lookup pass"""
+        return pd.Series(targets, dtype=object).map(self._target_color_lut).fillna(default).to_numpy()
+    
+    def _get_rule_soa(self, config: FirewallConfig) -> RuleSoA:
+        """Return the cached RuleSoA for config, building it on first use"""
+        layout = tuple((table_name, chain_name, len(rules))
+                       for table_name, chains in config.tables.items()
+                       for chain_name, rules in chains.items())
+        
+        key = id(config)
+        cached = self._soa_cache.get(key)
+        if cached is not None and cached[0]() is config and cached[1] == layout:
+            return cached[2]
+        
+        soa = _rules_to_soa(config)
+        cache = self._soa_cache
+        ref = weakref.ref(config, lambda _, key=key: cache.pop(key, None))
+        cache[key] = (ref, layout, soa)
+        return soa
     
     def _check_plotly_available(self):
         """Check if Plotly is available and raise error if not"""
         if not PLOTLY_AVAILABLE:
             raise ImportError("Plotly is required for interactive visualizations. Install with: pip install plotly")
     
+    def _empty_figure(self, title: str) -> Any:
+        """Build a placeholder Plotly figure for a configuration without rules"""
+        fig = go.Figure()
+        fig.add_annotation(
+            text='No rules to visualize',
+            xref='paper', yref='paper',
+            x=0.5, y=0.5,
+            showarrow=False,
+            font=dict(color="grey", size=16)
+        )
+        fig.update_layout(
+            title=title,
+            xaxis=dict(visible=False),
+            yaxis=dict(visible=False),
+            template='plotly_white'
+        )
+        return fig
+    
     def _check_matplotlib_available(self):
         """Check if Matplotlib is available and raise error if not"""
         if not MATPLOTLIB_AVAILABLE:
@@ -114,127 +473,171 @@ class FirewallVisualizer:
             raise ImportError("NetworkX is required for graph visualizations. Install with: pip install networkx")
     
     def create_rule_flow_diagram(self, config: FirewallConfig, 
-                               save_path: Optional[str] = None) -> Optional[Any]:
+                               save_path: Optional[str] = None,
+                               lazy: bool = False) -> Optional[Any]:
         """
         Create an interactive flow diagram showing rule processing flow
         
         Args:
             config: FirewallConfig to visualize
             save_path: Optional path to save the visualization
+            lazy: Defer building the figure until it is first used; ignored
+                when save_path is given
             
         Returns:
             Plotly figure object or None if Plotly not available
         """
         self._check_plotly_available()
         
+        if lazy and not save_path:
+            return _LazyFig(lambda: self._build_rule_flow_diagram(config))
+        
+        fig = self._build_rule_flow_diagram(config)
+        
+        if save_path:
+            self._write_html(fig, save_path)
+        
+        return fig
+    
+    def _build_rule_flow_diagram(self, config: FirewallConfig) -> Any:
+        """Build the figure for create_rule_flow_diagram"""
+        if _is_empty(config):
+            return self._empty_figure(self._FLOW_DIAGRAM_LAYOUT['title'])
+        
         fig = go.Figure()
         
-        # Process filter table (most common for visualization)
-        if 'filter' in config.tables:
-            chains = config.tables['filter']
+        soa = self._get_rule_soa(config)
+        
+        # Gather every filter chain (most common for visualization) into one
+        # detailed trace, and chains too long to label into one run trace
+        rule_ranges = []
+        rule_texts = []
+        run_index = []
+        run_positions = []
+        run_ends = []
+        for table_name, chain_name, start, stop in soa.chains:
+            if table_name != 'filter' or start == stop:
+                continue
             
-            for chain_name, rules in chains.items():
-                if not rules:
-                    continue
-                
-                # Create chain visualization
-                y_positions = list(range(len(rules)))
-                rule_texts = []
-                colors = []
-                
-                for i, rule in enumerate(rules):
-                    # Create descriptive text for each rule
-                    rule_text = self._format_rule_for_display(rule)
-                    rule_texts.append(rule_text)
-                    
-                    # Assign colors based on action
-                    if rule.target == 'ACCEPT':
-                        colors.append(self.colors['accept'])
-                    elif rule.target == 'DROP':
-                        colors.append(self.colors['drop'])
-                    elif rule.target == 'REJECT':
-                        colors.append(self.colors['reject'])
-                    else:
-                        colors.append(self.colors['chain'])
-                
-                # Add scatter plot for this chain
-                fig.add_trace(go.Scatter(
-                    x=[chain_name] * len(rules),
-                    y=y_positions,
-                    mode='markers+text',
-                    marker=dict(
-                        size=15,
-                        color=colors,
-                        symbol='square'
-                    ),
-                    text=rule_texts,
-                    textposition='middle right',
-                    name=f'{chain_name} Chain',
-                    hovertemplate='<b>%{text}</b><br>Chain: %{x}<br>Position: %{y}<extra></extra>'
-                ))
+            rule_count = stop - start
+            if rule_count > self.AGGREGATE_THRESHOLD:
+                # Collapse consecutive rules with the same target into one marker
+                targets = soa.target[start:stop]
+                run_starts = np.flatnonzero(np.r_[True, targets[1:] != targets[:-1]])
+                run_index.append(start + run_starts)
+                run_positions.append(run_starts)
+                run_ends.append(np.r_[run_starts[1:], rule_count] - 1)
+                continue
+            
+            rule_ranges.append(np.arange(start, stop))
+            rule_texts.extend(self._format_rules_for_display(soa, start, stop))
         
-        fig.update_layout(
-            title='Firewall Rule Flow Diagram',
-            xaxis_title='Chains',
-            yaxis_title='Rule Position (Top to Bottom)',
-            showlegend=True,
-            height=600,
-            template='plotly_white'
-        )
+        if rule_ranges:
+            index = np.concatenate(rule_ranges)
+            trace_type = go.Scattergl if len(index) > self.SCATTERGL_THRESHOLD else go.Scatter
+            
+            fig.add_trace(trace_type(
+                x=soa.chain[index],
+                y=soa.position[index],
+                mode='markers+text',
+                marker=dict(
+                    size=15,
+                    color=self._target_colors(soa.target[index], self.colors['chain']),
+                    symbol='square'
+                ),
+                text=rule_texts,
+                textposition='middle right',
+                name='Filter Rules',
+                hovertemplate='<b>%{text}</b><br>Chain: %{x}<br>Position: %{y}<extra></extra>'
+            ))
+        
+        if run_index:
+            index = np.concatenate(run_index)
+            targets = soa.target[index]
+            
+            fig.add_trace(go.Scattergl(
+                x=soa.chain[index],
+                y=np.concatenate(run_positions),
+                mode='markers',
+                marker=dict(
+                    size=15,
+                    color=self._target_colors(targets, self.colors['chain']),
+                    symbol='square'
+                ),
+                customdata=np.column_stack([np.concatenate(run_ends), targets]),
+                name='Filter Rule Runs',
+                hovertemplate='<b>Rules %{y}-%{customdata[0]} →%{customdata[1]}</b>'
+                              '<br>Chain: %{x}<extra></extra>'
+            ))
         
-        if save_path:
-            fig.write_html(save_path)
+        fig.update_layout(**self._FLOW_DIAGRAM_LAYOUT)
         
         return fig
     
     def create_issue_dashboard(self, analysis: AnalysisResult, 
-                             save_path: Optional[str] = None) -> Optional[Any]:
+                             save_path: Optional[str] = None,
+                             lazy: bool = False) -> Optional[Any]:
         """
         Create a comprehensive dashboard showing all identified issues
         
         Args:
             analysis: AnalysisResult containing identified issues
             save_path: Optional path to save the visualization
+            lazy: Defer building the figure until it is first used; ignored
+                when save_path is given
             
         Returns:
             Plotly figure with subplots or None if Plotly not available
         """
         self._check_plotly_available()
+        
+        if lazy and not save_path:
+            return _LazyFig(lambda: self._build_issue_dashboard(analysis))
+        
+        fig = self._build_issue_dashboard(analysis)
+        
+        if save_path:
+            self._write_html(fig, save_path)
+        
+        return fig
+    
+    def _build_issue_dashboard(self, analysis: AnalysisResult) -> Any:
+        """Build the figure for create_issue_dashboard"""
         # Create subplots
         fig = make_subplots(
             rows=2, cols=2,
-            subplot_titles=[
-                'Issues by Type',
-                'Issues by Severity', 
-                'Rule Statistics',
-                'Security & Efficiency Scores'
-            ],
-            specs=[[{'type': 'bar'}, {'type': 'pie'}],
-                   [{'type': 'bar'}, {'type': 'indicator'}]]
+            subplot_titles=self._DASHBOARD_SUBPLOT_TITLES,
+            specs=_subplot_specs(self._DASHBOARD_SUBPLOT_TYPES)
         )
         
-        # 1. Issues by Type
-        issue_counts = Counter(issue.issue_type.value for issue in analysis.issues)
-        if issue_counts:
+        # Issue types and severities, collected in one pass
+        issues = pd.DataFrame(
+            [(issue.issue_type.value, issue.severity.value) for issue in analysis.issues],
+            columns=['type', 'severity'], dtype=object
+        )
+        
+        # 1. Issues by Type (first-seen order)
+        issue_counts = issues['type'].value_counts(sort=False)
+        if len(issue_counts):
             fig.add_trace(
                 go.Bar(
-                    x=list(issue_counts.keys()),
-                    y=list(issue_counts.values()),
-                    marker_color=[self.colors.get(issue_type, '#3498db') 
-                                for issue_type in issue_counts.keys()],
+                    x=issue_counts.index,
+                    y=issue_counts.values,
+                    marker_color=self._color_series.reindex(
+                        issue_counts.index, fill_value='#3498db').to_numpy(),
                     name='Issues by Type'
                 ),
                 row=1, col=1
             )
         
         # 2. Issues by Severity
-        severity_counts = Counter(issue.severity.value for issue in analysis.issues)
-        if severity_counts:
+        severity_counts = issues['severity'].value_counts(sort=False)
+        if len(severity_counts):
             colors_severity = ['#27ae60', '#f39c12', '#e67e22', '#c0392b']  # low to critical
             fig.add_trace(
                 go.Pie(
-                    labels=list(severity_counts.keys()),
-                    values=list(severity_counts.values()),
+                    labels=severity_counts.index,
+                    values=severity_counts.values,
                     marker_colors=colors_severity[:len(severity_counts)],
                     name='Severity'
                 ),
@@ -271,16 +674,8 @@ class FirewallVisualizer:
                 gauge={
                     'axis': {'range': [None, 100]},
                     'bar': {'color': "darkblue"},
-                    'steps': [
-                        {'range': [0, 50], 'color': "lightgray"},
-                        {'range': [50, 80], 'color': "yellow"},
-                        {'range': [80, 100], 'color': "green"}
-                    ],
-                    'threshold': {
-                        'line': {'color': "red", 'width': 4},
-                        'thickness': 0.75,
-                        'value': 90
-                    }
+                    'steps': self._GAUGE_STEPS,
+                    'threshold': dict(self._GAUGE_THRESHOLD)
                 }
             ),
             row=2, col=2
@@ -296,113 +691,112 @@ class FirewallVisualizer:
                 gauge={
                     'axis': {'range': [None, 100]},
                     'bar': {'color': "darkgreen"},
-                    'steps': [
-                        {'range': [0, 50], 'color': "lightgray"},
-                        {'range': [50, 80], 'color': "yellow"},
-                        {'range': [80, 100], 'color': "green"}
-                    ],
-                    'threshold': {
-                        'line': {'color': "red", 'width': 4},
-                        'thickness': 0.75,
-                        'value': 90
-                    }
+                    'steps': self._GAUGE_STEPS,
+                    'threshold': dict(self._GAUGE_THRESHOLD)
                 }
             ),
             row=2, col=2
         )
         
-        fig.update_layout(
-            title='Firewall Analysis Dashboard',
-            height=800,
-            showlegend=False,
-            template='plotly_white'
-        )
-        
-        if save_path:
-            fig.write_html(save_path)
+        fig.update_layout(**self._DASHBOARD_LAYOUT)
         
         return fig
     
     def create_rule_dependency_graph(self, config: FirewallConfig, 
-                                   save_path: Optional[str] = None) -> Optional[Any]:
+                                   save_path: Optional[str] = None,
+                                   lazy: bool = False) -> Optional[Any]:
         """
         Create a network graph showing rule dependencies and chain relationships
         
         Args:
             config: FirewallConfig to analyze
             save_path: Optional path to save the visualization
+            lazy: Defer building the figure until it is first used; ignored
+                when save_path is given
             
         Returns:
             Plotly figure with network graph or None if dependencies not available
         """
         self._check_plotly_available()
         self._check_networkx_available()
-        # Create networkx graph
-        G = nx.DiGraph()
         
-        # Add nodes for chains and rules
-        node_colors = []
-        node_sizes = []
-        node_texts = []
-        
-        for table_name, chains in config.tables.items():
-            for chain_name, rules in chains.items():
-                # Add chain node
-                chain_node = f"{table_name}:{chain_name}"
-                G.add_node(chain_node)
-                node_colors.append(self.colors['chain'])
-                node_sizes.append(30)
-                node_texts.append(f"Chain: {chain_name}")
+        if lazy and not save_path:
+            return _LazyFig(lambda: self._build_rule_dependency_graph(config))
+        
+        fig = self._build_rule_dependency_graph(config)
+        
+        if save_path:
+            self._write_html(fig, save_path)
+        
+        return fig
+    
+    def _build_rule_dependency_graph(self, config: FirewallConfig) -> Any:
+        """Build the figure for create_rule_dependency_graph"""
+        if _is_empty(config):
+            return self._empty_figure(self._DEPENDENCY_GRAPH_LAYOUT['title']['text'])
+        
+        soa = self._get_rule_soa(config)
+        
+        # Chain names of every table, and chain nodes already walked
+        all_chain_names = frozenset(chain_name for _, chain_name, _, _ in soa.chains)
+        chain_nodes = set()
+        
+        # Nodes carry their marker color, size and label as attributes
+        nodes = []
+        edges = []
+        
+        for table_name, chain_name, start, stop in soa.chains:
+            # Add chain node
+            chain_node = f"{table_name}:{chain_name}"
+            chain_nodes.add(chain_node)
+            nodes.append((chain_node, {'color': self.colors['chain'], 'size': 30,
+                                       'text': f"Chain: {chain_name}"}))
+            
+            # Color rule nodes based on rule action
+            targets = soa.target[start:stop]
+            colors = self._target_colors(targets, self.colors['log'])
+            
+            # Add rule nodes and connections
+            for i, (target, jump_target, color) in enumerate(
+                    zip(targets, soa.jump_target[start:stop], colors)):
+                rule_node = f"{chain_node}:rule_{i}"
+                nodes.append((rule_node, {'color': color, 'size': 15,
+                                          'text': f"Rule {i+1}: {target}"}))
+                edges.append((chain_node, rule_node))
                 
-                # Add rule nodes and connections
-                for i, rule in enumerate(rules):
-                    rule_node = f"{chain_node}:rule_{i}"
-                    G.add_node(rule_node)
-                    G.add_edge(chain_node, rule_node)
-                    
-                    # Color based on rule action
-                    if rule.target == 'ACCEPT':
-                        node_colors.append(self.colors['accept'])
-                    elif rule.target == 'DROP':
-                        node_colors.append(self.colors['drop'])
-                    elif rule.target == 'REJECT':
-                        node_colors.append(self.colors['reject'])
-                    else:
-                        node_colors.append(self.colors['log'])
-                    
-                    node_sizes.append(15)
-                    node_texts.append(f"Rule {i+1}: {rule.target}")
-                    
-                    # Add jump connections
-                    if rule.jump_target and rule.jump_target in [c for _, chains in config.tables.items() for c in chains.keys()]:
-                        target_chain = f"{table_name}:{rule.jump_target}"
-                        if target_chain in G.nodes():
-                            G.add_edge(rule_node, target_chain)
+                # Add jump connections
+                if jump_target and jump_target in all_chain_names:
+                    target_chain = f"{table_name}:{jump_target}"
+                    if target_chain in chain_nodes:
+                        edges.append((rule_node, target_chain))
+        
+        # Create networkx graph
+        G = nx.DiGraph()
+        G.add_nodes_from(nodes)
+        G.add_edges_from(edges)
         
         # Create layout
-        pos = nx.spring_layout(G, k=3, iterations=50)
+        pos = self._compute_layout(G)
         
         # Extract coordinates
-        edge_x = []
-        edge_y = []
-        for edge in G.edges():
-            x0, y0 = pos[edge[0]]
-            x1, y1 = pos[edge[1]]
-            edge_x.extend([x0, x1, None])
-            edge_y.extend([y0, y1, None])
-        
-        node_x = []
-        node_y = []
-        for node in G.nodes():
-            x, y = pos[node]
-            node_x.append(x)
-            node_y.append(y)
+        node_index = {node: i for i, node in enumerate(G.nodes())}
+        pos_arr = np.array([pos[node] for node in node_index], dtype=np.float64).reshape(-1, 2)
+        node_x, node_y = pos_arr[:, 0], pos_arr[:, 1]
+        
+        # Each edge becomes start, end and a NaN gap that breaks the line
+        edges = np.array([(node_index[u], node_index[v]) for u, v in G.edges()],
+                         dtype=np.intp).reshape(-1, 2)
+        edge_start = pos_arr[edges[:, 0]]
+        edge_end = pos_arr[edges[:, 1]]
+        gap = np.full(len(edges), np.nan)
+        edge_x = np.column_stack([edge_start[:, 0], edge_end[:, 0], gap]).ravel()
+        edge_y = np.column_stack([edge_start[:, 1], edge_end[:, 1], gap]).ravel()
         
         # Create figure
         fig = go.Figure()
         
         # Add edges
-        fig.add_trace(go.Scatter(
+        fig.add_trace(go.Scattergl(
             x=edge_x, y=edge_y,
             line=dict(width=2, color='#888'),
             hoverinfo='none',
@@ -410,79 +804,98 @@ class FirewallVisualizer:
         ))
         
         # Add nodes
-        fig.add_trace(go.Scatter(
+        fig.add_trace(go.Scattergl(
             x=node_x, y=node_y,
             mode='markers+text',
             hoverinfo='text',
-            text=node_texts,
+            text=list(nx.get_node_attributes(G, 'text').values()),
             textposition="middle center",
             marker=dict(
-                size=node_sizes,
-                color=node_colors,
+                size=list(nx.get_node_attributes(G, 'size').values()),
+                color=list(nx.get_node_attributes(G, 'color').values()),
                 line=dict(width=2, color='white')
             )
         ))
         
-        fig.update_layout(
-            title='Firewall Rule Dependency Graph',
-            titlefont_size=16,
-            showlegend=False,
-            hovermode='closest',
-            margin=dict(b=20,l=5,r=5,t=40),
-            annotations=[ dict(
-                text="Chains and rule relationships",
-                showarrow=False,
-                xref="paper", yref="paper",
-                x=0.005, y=-0.002,
-                xanchor='left', yanchor='bottom',
-                font=dict(color="grey", size=12)
-            )],
-            xaxis=dict(showgrid=False, zeroline=False, showticklabels=False),
-            yaxis=dict(showgrid=False, zeroline=False, showticklabels=False),
-            template='plotly_white'
-        )
-        
-        if save_path:
-            fig.write_html(save_path)
+        fig.update_layout(**self._DEPENDENCY_GRAPH_LAYOUT)
         
         return fig
     
+    def _compute_layout(self, G: Any) -> Dict[Any, Any]:
+        """
+        Compute node positions for a graph
+        
+        Uses Graphviz's sfdp when pygraphviz is installed, otherwise a seeded
+        spring layout whose iteration count shrinks as the graph grows.
+        
+        Args:
+            G: NetworkX graph to lay out
+            
+        Returns:
+            Dictionary mapping nodes to (x, y) positions
+        """
+        nodes = list(G.nodes())
+        
+        try:
+            # Integer labels keep node names containing ':' from being read
+            # as DOT ports
+            int_pos = nx.nx_agraph.graphviz_layout(
+                nx.convert_node_labels_to_integers(G), prog='sfdp')
+            return {node: int_pos[i] for i, node in enumerate(nodes)}
+        except (ImportError, OSError, ValueError):
+            pass
+        
+        iterations = min(50, max(10, int(200 / np.sqrt(max(len(nodes), 1)))))
+        return nx.spring_layout(G, k=3, iterations=iterations, seed=0)
+    
     def create_optimization_impact_chart(self, plan: OptimizationPlan, 
-                                       save_path: Optional[str] = None) -> Optional[Any]:
+                                       save_path: Optional[str] = None,
+                                       lazy: bool = False) -> Optional[Any]:
         """
         Create a chart showing the impact of optimization recommendations
         
         Args:
             plan: OptimizationPlan containing recommendations
             save_path: Optional path to save the visualization
+            lazy: Defer building the figure until it is first used; ignored
+                when save_path is given
             
         Returns:
             Plotly figure or None if Plotly not available
         """
         self._check_plotly_available()
+        
+        if lazy and not save_path:
+            return _LazyFig(lambda: self._build_optimization_impact_chart(plan))
+        
+        fig = self._build_optimization_impact_chart(plan)
+        
+        if save_path:
+            self._write_html(fig, save_path)
+        
+        return fig
+    
+    def _build_optimization_impact_chart(self, plan: OptimizationPlan) -> Any:
+        """Build the figure for create_optimization_impact_chart"""
         # Analyze recommendations
-        rec_types = [rec.rec_type.value for rec in plan.recommendations]
-        priorities = [rec.priority.value for rec in plan.recommendations]
+        rec_count = len(plan.recommendations)
+        rec_types, type_counts = _value_counts(
+            (rec.rec_type.value for rec in plan.recommendations), rec_count)
+        priorities, priority_counts = _value_counts(
+            (rec.priority.value for rec in plan.recommendations), rec_count)
         
         # Create subplots
         fig = make_subplots(
             rows=2, cols=2,
-            subplot_titles=[
-                'Recommendations by Type',
-                'Recommendations by Priority',
-                'Estimated Impact',
-                'Implementation Risk'
-            ],
-            specs=[[{'type': 'bar'}, {'type': 'bar'}],
-                   [{'type': 'bar'}, {'type': 'pie'}]]
+            subplot_titles=self._IMPACT_SUBPLOT_TITLES,
+            specs=_subplot_specs(self._IMPACT_SUBPLOT_TYPES)
         )
         
         # 1. Recommendations by Type
-        type_counts = Counter(rec_types)
         fig.add_trace(
             go.Bar(
-                x=list(type_counts.keys()),
-                y=list(type_counts.values()),
+                x=rec_types,
+                y=type_counts,
                 marker_color='#3498db',
                 name='By Type'
             ),
@@ -490,13 +903,12 @@ class FirewallVisualizer:
         )
         
         # 2. Recommendations by Priority
-        priority_counts = Counter(priorities)
         priority_colors = {1: '#27ae60', 2: '#f39c12', 3: '#e67e22', 4: '#c0392b'}
         fig.add_trace(
             go.Bar(
-                x=[f"Priority {p}" for p in priority_counts.keys()],
-                y=list(priority_counts.values()),
-                marker_color=[priority_colors.get(p, '#3498db') for p in priority_counts.keys()],
+                x=[f"Priority {p}" for p in priorities],
+                y=priority_counts,
+                marker_color=[priority_colors.get(p, '#3498db') for p in priorities],
                 name='By Priority'
             ),
             row=1, col=2
@@ -517,29 +929,21 @@ class FirewallVisualizer:
         )
         
         # 4. Risk Distribution
-        risk_levels = [rec.risk_level for rec in plan.recommendations]
-        risk_counts = Counter(risk_levels)
+        risk_levels, risk_counts = _value_counts(
+            (rec.risk_level for rec in plan.recommendations), rec_count)
         risk_colors = {'low': '#27ae60', 'medium': '#f39c12', 'high': '#e74c3c'}
         
         fig.add_trace(
             go.Pie(
-                labels=list(risk_counts.keys()),
-                values=list(risk_counts.values()),
-                marker_colors=[risk_colors.get(risk, '#3498db') for risk in risk_counts.keys()],
+                labels=risk_levels,
+                values=risk_counts,
+                marker_colors=[risk_colors.get(risk, '#3498db') for risk in risk_levels],
                 name='Risk'
             ),
             row=2, col=2
         )
         
-        fig.update_layout(
-            title='Optimization Plan Impact Analysis',
-            height=800,
-            showlegend=False,
-            template='plotly_white'
-        )
-        
-        if save_path:
-            fig.write_html(save_path)
+        fig.update_layout(**self._IMPACT_LAYOUT)
         
         return fig
     
@@ -555,54 +959,30 @@ class FirewallVisualizer:
         Returns:
             Matplotlib figure
         """
-        # Collect data for heatmap
-        protocols = []
-        ports = []
-        actions = []
-        
-        for table_name, chains in config.tables.items():
-            for chain_name, rules in chains.items():
-                for rule in rules:
-                    protocols.append(rule.protocol or 'any')
-                    
-                    if rule.destination_port:
-                        try:
-                            port = int(rule.destination_port)
-                            if port <= 65535:
-                                ports.append(port)
-                            else:
-                                ports.append(0)  # Invalid port
-                        except ValueError:
-                            ports.append(0)  # Port range or invalid
-                    else:
-                        ports.append(0)  # Any port
-                    
-                    actions.append(rule.target)
-        
-        if not protocols:
+        if _is_empty(config):
             # No data to visualize
             fig, ax = plt.subplots(figsize=(10, 6))
             ax.text(0.5, 0.5, 'No rules to visualize', 
                    ha='center', va='center', transform=ax.transAxes)
             return fig
         
-        # Create DataFrame
-        df = pd.DataFrame({
-            'Protocol': protocols,
-            'Port': ports,
-            'Action': actions
-        })
-        
-        # Create pivot table for heatmap
-        port_ranges = ['0', '1-1023', '1024-49151', '49152-65535']
-        df['PortRange'] = df['Port'].apply(lambda x: 
-            '0' if x == 0 else
-            '1-1023' if 1 <= x <= 1023 else
-            '1024-49151' if 1024 <= x <= 49151 else
-            '49152-65535')
-        
-        # Create pivot table
-        pivot = df.groupby(['Protocol', 'PortRange', 'Action']).size().unstack(fill_value=0)
+        # Collect data for heatmap
+        soa = self._get_rule_soa(config)
+        protocols = np.where(soa.protocol.astype(bool), soa.protocol, 'any')
+        ports = soa.port
+        actions = soa.target
+        
+        # Bucket ports into ranges and count rules per protocol/range/action
+        range_codes = np.digitize(ports, _PORT_RANGE_BINS)
+        
+        if NUMBA_AVAILABLE and len(protocols) > HEATMAP_JIT_THRESHOLD:
+            pivot = _heatmap_pivot_jit(protocols, range_codes, actions)
+        else:
+            port_ranges = np.array(_PORT_RANGE_LABELS, dtype=object)[range_codes]
+            pivot = pd.crosstab(
+                [pd.Series(protocols, name='Protocol'), pd.Series(port_ranges, name='PortRange')],
+                pd.Series(actions, name='Action')
+            )
         
         # Create the plot
         fig, ax = plt.subplots(figsize=(12, 8))
@@ -618,26 +998,50 @@ class FirewallVisualizer:
         plt.tight_layout()
         
         if save_path:
-            plt.savefig(save_path, dpi=300, bbox_inches='tight')
+            self._save_png(fig, save_path)
         
         return fig
     
-    def _format_rule_for_display(self, rule: FirewallRule) -> str:
-        """Format a rule for display in visualizations"""
-        parts = []
-        
-        if rule.protocol:
-            parts.append(f"proto:{rule.protocol}")
-        
-        if rule.source_ip:
-            parts.append(f"src:{rule.source_ip}")
+    def _save_png(self, fig: plt.Figure, path: str, dpi: int = 300):
+        """Render a matplotlib figure once through Agg and write it as PNG
         
-        if rule.destination_port:
-            parts.append(f"port:{rule.destination_port}")
+        The layout is already fixed by tight_layout(), so the extra
+        bbox_inches='tight' extent pass of savefig() is skipped.
+        """
+        if not PIL_AVAILABLE:
+            fig.savefig(path, dpi=dpi)
+            return
         
-        parts.append(f"→{rule.target}")
+        original_dpi = fig.get_dpi()
+        original_canvas = fig.canvas
+        try:
+            fig.set_dpi(dpi)
+            canvas = FigureCanvasAgg(fig)
+            canvas.draw()
+            Image.frombuffer('RGBA', canvas.get_width_height(), canvas.buffer_rgba(),
+                             'raw', 'RGBA', 0, 1).save(path, 'PNG')
+        finally:
+            fig.set_dpi(original_dpi)
+            fig.set_canvas(original_canvas)
+    
+    def _format_rules_for_display(self, soa: RuleSoA, start: int, stop: int) -> List[str]:
+        """
+        Format a slice of rules for display, reading the RuleSoA columns
         
-        return " ".join(parts) if parts else rule.raw_rule[:50]
+        Each rule becomes "proto:<protocol> src:<source> port:<port> →<target>",
+        leaving out the fields a rule does not set.
+        """
+        return [
+            f"{f'proto:{protocol} ' if protocol else ''}"
+            f"{f'src:{source_ip} ' if source_ip else ''}"
+            f"{f'port:{port} ' if port else ''}→{target}"
+            for protocol, source_ip, port, target in zip(
+                soa.protocol[start:stop].tolist(),
+                soa.source_ip[start:stop].tolist(),
+                soa.destination_port[start:stop].tolist(),
+                soa.target[start:stop].tolist()
+            )
+        ]
     
     def create_comprehensive_report(self, config: FirewallConfig, 
                                   analysis: AnalysisResult,
@@ -655,48 +1059,105 @@ class FirewallVisualizer:
         Returns:
             Dictionary with paths to generated files
         """
-        import os
-        
         files_created = {}
         
-        # Create individual visualizations
+        # Build the shared rule view once instead of in each worker
         try:
-            # Rule flow diagram
-            flow_fig = self.create_rule_flow_diagram(config)
-            flow_path = os.path.join(output_dir, "rule_flow.html")
-            flow_fig.write_html(flow_path)
-            files_created['flow_diagram'] = flow_path
-            
-            # Issue dashboard
-            dashboard_fig = self.create_issue_dashboard(analysis)
-            dashboard_path = os.path.join(output_dir, "issue_dashboard.html")
-            dashboard_fig.write_html(dashboard_path)
-            files_created['dashboard'] = dashboard_path
-            
-            # Dependency graph
-            graph_fig = self.create_rule_dependency_graph(config)
-            graph_path = os.path.join(output_dir, "dependency_graph.html")
-            graph_fig.write_html(graph_path)
-            files_created['dependency_graph'] = graph_path
+            self._get_rule_soa(config)
+        except Exception as e:
+            self.logger.warning(f"Failed to prepare rule data: {e}")
+        
+        plotly_tasks = {
+            'flow_diagram': (self._save_flow_diagram, config),
+            'dashboard': (self._save_issue_dashboard, analysis),
+            'dependency_graph': (self._save_dependency_graph, config),
+            'optimization_impact': (self._save_optimization_impact, plan)
+        }
+        
+        # The Plotly charts are independent and render in worker threads;
+        # the matplotlib heatmap stays on the calling thread because pyplot
+        # is not thread-safe
+        with ThreadPoolExecutor(max_workers=len(plotly_tasks)) as executor:
+            futures = {name: executor.submit(func, data, output_dir)
+                       for name, (func, data) in plotly_tasks.items()}
             
-            # Optimization impact
-            impact_fig = self.create_optimization_impact_chart(plan)
-            impact_path = os.path.join(output_dir, "optimization_impact.html")
-            impact_fig.write_html(impact_path)
-            files_created['optimization_impact'] = impact_path
+            try:
+                heatmap_path = self._save_heatmap(config, output_dir)
+            except Exception as e:
+                heatmap_path = None
+                self.logger.error(f"Error creating heatmap visualization: {e}")
             
-            # Rule heatmap
-            heatmap_fig = self.create_rule_heatmap(config)
-            heatmap_path = os.path.join(output_dir, "rule_heatmap.png")
-            heatmap_fig.savefig(heatmap_path, dpi=300, bbox_inches='tight')
-            plt.close(heatmap_fig)
+            for name, future in futures.items():
+                try:
+                    files_created[name] = future.result()
+                except Exception as e:
+                    self.logger.error(f"Error creating {name} visualization: {e}")
+        
+        if heatmap_path:
             files_created['heatmap'] = heatmap_path
-            
-        except Exception as e:
-            self.logger.error(f"Error creating visualizations: {e}")
+        
+        if files_created:
+            try:
+                files_created['index'] = self._write_report_index(files_created, output_dir)
+            except Exception as e:
+                self.logger.error(f"Error creating report index: {e}")
         
         return files_created
-
+    
+    def _write_report_index(self, files_created: Dict[str, str], output_dir: str) -> str:
+        """Write an index.html that embeds every generated report file"""
+        sections = []
+        for name, path in files_created.items():
+            title = name.replace('_', ' ').title()
+            filename = os.path.basename(path)
+            if filename.endswith('.html'):
+                embed = f'<iframe src="{filename}" style="width:100%;height:850px;border:none"></iframe>'
+            else:
+                embed = f'<img src="{filename}" alt="{title}" style="max-width:100%">'
+            sections.append(f'<h2>{title}</h2>\n{embed}')
+        
+        index_path = os.path.join(output_dir, "index.html")
+        with open(index_path, 'w', encoding='utf-8') as f:
+            f.write('<!DOCTYPE html>\n<html>\n<head><meta charset="utf-8">'
+                    '<title>Firewall Optimization Report</title></head>\n<body>\n'
+                    '<h1>Firewall Optimization Report</h1>\n')
+            f.write('\n'.join(sections))
+            f.write('\n</body>\n</html>\n')
+        return index_path
+    
+    def _save_flow_diagram(self, config: FirewallConfig, output_dir: str) -> str:
+        """Build the rule flow diagram and save it to output_dir"""
+        flow_path = os.path.join(output_dir, "rule_flow.html")
+        self._write_html(self.create_rule_flow_diagram(config), flow_path)
+        return flow_path
+    
+    def _save_issue_dashboard(self, analysis: AnalysisResult, output_dir: str) -> str:
+        """Build the issue dashboard and save it to output_dir"""
+        dashboard_path = os.path.join(output_dir, "issue_dashboard.html")
+        self._write_html(self.create_issue_dashboard(analysis), dashboard_path)
+        return dashboard_path
+    
+    def _save_dependency_graph(self, config: FirewallConfig, output_dir: str) -> str:
+        """Build the rule dependency graph and save it to output_dir"""
+        graph_path = os.path.join(output_dir, "dependency_graph.html")
+        self._write_html(self.create_rule_dependency_graph(config), graph_path)
+        return graph_path
+    
+    def _save_optimization_impact(self, plan: OptimizationPlan, output_dir: str) -> str:
+        """Build the optimization impact chart and save it to output_dir"""
+        impact_path = os.path.join(output_dir, "optimization_impact.html")
+        self._write_html(self.create_optimization_impact_chart(plan), impact_path)
+        return impact_path
+    
+    def _save_heatmap(self, config: FirewallConfig, output_dir: str) -> str:
+        """Build the rule heatmap and save it to output_dir as PNG"""
+        heatmap_path = os.path.join(output_dir, "rule_heatmap.png")
+        heatmap_fig = self.create_rule_heatmap(config)
+        try:
+            self._save_png(heatmap_fig, heatmap_path)
+        finally:
+            plt.close(heatmap_fig)
+        return heatmap_path
 
 def main():
     """Example usage of the visualizer"""
@@ -729,8 +1190,8 @@ COMMIT
     plan = recommender.generate_recommendations(config, analysis)
     
     # Create visualizations
-    flow_fig = visualizer.create_rule_flow_diagram(config)
-    dashboard_fig = visualizer.create_issue_dashboard(analysis)
+    flow_fig = visualizer.create_rule_flow_diagram(config, lazy=True)
+    dashboard_fig = visualizer.create_issue_dashboard(analysis, lazy=True)
     
     print("Visualizations created successfully!")
     print("Use flow_fig.show() and dashboard_fig.show() to display them")
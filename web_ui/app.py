@@ -10,6 +10,7 @@ explore recommendations, and visualize their firewall rules.
 try:
     import streamlit as st
     import pandas as pd
+    import pyarrow as pa
     STREAMLIT_AVAILABLE = True
 except ImportError:
     STREAMLIT_AVAILABLE = False
@@ -17,16 +18,19 @@ except ImportError:
     print("Install with: pip install streamlit pandas")
 
 import os
+import hashlib
 import tempfile
 import io
-from typing import Optional, Dict, Any
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Tuple
 import logging
 
 # Import optimizer components
 try:
     from optimizer import (
         IptablesParser, FirewallAnalyzer, FirewallRecommender, 
-        FirewallVisualizer, ConfigManager, BackupManager, SystemInterface
+        FirewallVisualizer, ConfigManager, BackupManager, SystemInterface,
+        RecommendationPriority
     )
 except ImportError:
     # Fallback for development
@@ -34,10 +38,290 @@ except ImportError:
     sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
     from optimizer import (
         IptablesParser, FirewallAnalyzer, FirewallRecommender, 
-        FirewallVisualizer, ConfigManager, BackupManager, SystemInterface
+        FirewallVisualizer, ConfigManager, BackupManager, SystemInterface,
+        RecommendationPriority
     )
 
 
+def _passthrough_decorator(func=None, **kwargs):
+    """Stand-in for Streamlit decorators that are unavailable"""
+    return func if func is not None else (lambda f: f)
+
+_cache_data = st.cache_data if STREAMLIT_AVAILABLE else _passthrough_decorator
+_cache_resource = st.cache_resource if STREAMLIT_AVAILABLE else _passthrough_decorator
+
+# Tab bodies are fragments, so a widget inside one tab reruns only that tab
+_fragment = st.fragment if STREAMLIT_AVAILABLE else _passthrough_decorator
+
+# Streamlit reruns the whole script on every interaction, so pipeline results
+# are cached. Configurations and analyses are passed as underscore-prefixed
+# arguments, which Streamlit does not hash; a short key names them instead.
+# Entries are shared by every session and left to ttl and max_entries to evict.
+# Most caches hold one entry per configuration.
+_CACHE_TTL = 3600
+_CACHE_MAX_ENTRIES = 16
+
+_VISUALIZATIONS = (
+    "Rule Flow Diagram",
+    "Issues Dashboard",
+    "Dependency Graph",
+    "Optimization Impact",
+    "Rule Coverage Heatmap"
+)
+# Configurations that keep a figure cached for every visualization; figures
+# are large, so this stays below _CACHE_MAX_ENTRIES
+_VISUALIZATION_CACHE_CONFIGS = 4
+
+# Sample rules shipped with the project, found independently of the working directory
+_SAMPLE_PATH = Path(__file__).resolve().parent.parent / "data" / "sample_rules.txt"
+
+# Chains listed per page in an overview table expander
+_CHAINS_PER_PAGE = 25
+
+
+_SEVERITY_COLOR = {
+    'low': '🟢',
+    'medium': '🟡',
+    'high': '🟠',
+    'critical': '🔴'
+}
+
+# Recommendation priorities in display order
+_PRIORITY_COLOR = {
+    RecommendationPriority.CRITICAL: "🔴",
+    RecommendationPriority.HIGH: "🟠",
+    RecommendationPriority.MEDIUM: "🟡",
+    RecommendationPriority.LOW: "🟢"
+}
+
+
+def _content_key(content) -> str:
+    """Cache key for the configuration parsed from iptables-save text or its UTF-8 bytes"""
+    if isinstance(content, str):
+        content = content.encode('utf-8')
+    return hashlib.blake2b(content, digest_size=16).hexdigest()
+
+
+@_cache_resource
+def _pipeline_components():
+    """Parser, analyzer and recommender; they keep no per-run state"""
+    return IptablesParser(), FirewallAnalyzer(), FirewallRecommender()
+
+
+@_cache_resource
+def _shared_components():
+    """Visualizer and backup manager; like the pipeline they are safe to share"""
+    return FirewallVisualizer(), BackupManager()
+
+
+@_cache_data(show_spinner=False, ttl=_CACHE_TTL, max_entries=_CACHE_MAX_ENTRIES)
+def _parse(content: str):
+    """Parse iptables-save text into a FirewallConfig"""
+    parser, _, _ = _pipeline_components()
+    return parser.parse_iptables_save(content)
+
+
+@_cache_data(show_spinner=False, ttl=_CACHE_TTL, max_entries=_CACHE_MAX_ENTRIES)
+def _parse_upload(config_key: str, _uploaded_file):
+    """Parse an uploaded iptables-save file, decoding it one line at a time"""
+    parser, _, _ = _pipeline_components()
+    _uploaded_file.seek(0)
+    stream = io.TextIOWrapper(_uploaded_file, encoding='utf-8', newline='')
+    try:
+        return parser.parse_iptables_save_lines(stream)
+    finally:
+        # Hand the buffer back to Streamlit instead of closing it with the wrapper
+        stream.detach()
+
+
+@_cache_data(show_spinner=False, ttl=_CACHE_TTL, max_entries=_CACHE_MAX_ENTRIES)
+def _analyze(_config, config_key: str):
+    """Analyze the configuration identified by config_key"""
+    _, analyzer, _ = _pipeline_components()
+    return analyzer.analyze_configuration(_config)
+
+
+@_cache_data(show_spinner=False, ttl=_CACHE_TTL, max_entries=_CACHE_MAX_ENTRIES)
+def _recommend(_config, _analysis, config_key: str):
+    """Generate recommendations for the configuration identified by config_key"""
+    _, _, recommender = _pipeline_components()
+    return recommender.generate_recommendations(_config, _analysis)
+
+
+def _summarize_config(config) -> Dict[str, Any]:
+    """
+    Totals and per-chain rule tables shown on the overview tab
+    
+    Returns:
+        Dictionary with total_rules, total_chains, total_tables and tables,
+        a list of (table_name, [(chain_name, rule_count, rules_df)]) where
+        rules_df lists the chain's rules, or is None for an empty chain
+    """
+    tables = []
+    total_rules = 0
+    total_chains = 0
+    for table_name, chains in config.tables.items():
+        chain_rows = []
+        for chain_name, rules in chains.items():
+            rules_df = pd.DataFrame({
+                "Line": [rule.line_number for rule in rules],
+                "Rule": [rule.raw_rule for rule in rules]
+            }) if rules else None
+            chain_rows.append((chain_name, len(rules), rules_df))
+            total_rules += len(rules)
+        total_chains += len(chains)
+        tables.append((table_name, chain_rows))
+    
+    return {
+        'total_rules': total_rules,
+        'total_chains': total_chains,
+        'total_tables': len(config.tables),
+        'tables': tables
+    }
+
+
+@_cache_data(show_spinner=False, ttl=_CACHE_TTL, max_entries=_CACHE_MAX_ENTRIES)
+def _overview_stats(_config, config_key: str) -> Dict[str, Any]:
+    """Overview summary of the configuration identified by config_key"""
+    return _summarize_config(_config)
+
+
+def _statistics_table(statistics: Dict[str, Any]):
+    """Analysis statistics as an Arrow table with display names for the metrics"""
+    stats_df = pd.DataFrame({
+        "Metric": [k.replace('_', ' ').title() for k in statistics],
+        "Value": list(statistics.values())
+    })
+    return pa.Table.from_pandas(stats_df)
+
+
+@_cache_data(show_spinner=False, ttl=_CACHE_TTL, max_entries=_CACHE_MAX_ENTRIES)
+def _analysis_statistics(_analysis, config_key: str):
+    """Statistics table of the analysis made for config_key"""
+    return _statistics_table(_analysis.statistics)
+
+
+def _group_issues(issues_by_type) -> Dict[Any, list]:
+    """Pair each issue of the analysis' type groups with its severity icon"""
+    return {
+        issue_type: [(_SEVERITY_COLOR.get(issue.severity.value, '⚪'), issue) for issue in issues]
+        for issue_type, issues in issues_by_type.items()
+    }
+
+
+@_cache_resource(show_spinner=False, ttl=_CACHE_TTL, max_entries=_CACHE_MAX_ENTRIES)
+def _issue_groups(_analysis, config_key: str) -> Dict[Any, list]:
+    """
+    Issues of the analysis made for config_key, grouped by type
+    
+    Shared rather than copied on each rerun, so callers must not modify it.
+    """
+    return _group_issues(_analysis.issues_by_type)
+
+
+def _group_recommendations(plan) -> List[Tuple[Any, list, Any]]:
+    """
+    Recommendations by priority, most urgent first
+    
+    Returns:
+        List of (priority, recommendations, summary_df) for each priority
+        that has recommendations
+    """
+    groups = []
+    for priority in _PRIORITY_COLOR:
+        recs = plan.get_by_priority(priority)
+        if not recs:
+            continue
+        summary_df = pd.DataFrame({
+            "#": range(1, len(recs) + 1),
+            "Recommendation": [rec.title for rec in recs],
+            "Impact": [rec.estimated_impact for rec in recs],
+            "Risk": [rec.risk_level for rec in recs],
+            "Affected Rules": [len(rec.affected_rules) for rec in recs]
+        })
+        groups.append((priority, recs, summary_df))
+    return groups
+
+
+@_cache_resource(show_spinner=False, ttl=_CACHE_TTL, max_entries=_CACHE_MAX_ENTRIES)
+def _recommendation_groups(_plan, config_key: str) -> List[Tuple[Any, list, Any]]:
+    """
+    Recommendations of the plan made for config_key, grouped by priority
+    
+    Shared rather than copied on each rerun, so callers must not modify it.
+    """
+    return _group_recommendations(_plan)
+
+
+@_cache_data(show_spinner=False, max_entries=4)
+def _read_sample(path: str, mtime: float) -> str:
+    """Contents of the sample rules file; mtime makes an edited file a new entry"""
+    with open(path, 'r') as f:
+        return f.read()
+
+
+@_cache_data(show_spinner=False)
+def _builtin_sample_rules(_system_interface) -> str:
+    """Built-in sample rules used when the sample file is missing"""
+    return _system_interface._get_sample_rules()
+
+
+@_cache_data(show_spinner=False, ttl=10)
+def _list_backups(_backup_manager, backup_dir: str, dir_mtime: Optional[float]):
+    """
+    Backups in backup_dir
+    
+    dir_mtime changes when a backup is added or removed, so the directory is
+    rescanned then, and otherwise at most every few seconds.
+    """
+    return _backup_manager.list_backups()
+
+
+def _figure_png(fig) -> bytes:
+    """Render a matplotlib figure to PNG the way st.pyplot does, then close it"""
+    import matplotlib.pyplot as plt
+    buffer = io.BytesIO()
+    try:
+        fig.savefig(buffer, format='png', dpi=200, bbox_inches='tight')
+    finally:
+        # pyplot keeps every open figure alive until it is closed
+        plt.close(fig)
+    return buffer.getvalue()
+
+
+def _build_visualization(viz_type: str, visualizer, config, analysis, plan):
+    """
+    Create one entry of the visualization picker
+    
+    Returns:
+        A Plotly figure, or PNG bytes for the matplotlib heatmap
+    """
+    if viz_type == "Rule Flow Diagram":
+        return visualizer.create_rule_flow_diagram(config)
+    if viz_type == "Issues Dashboard":
+        return visualizer.create_issue_dashboard(analysis)
+    if viz_type == "Dependency Graph":
+        return visualizer.create_rule_dependency_graph(config)
+    if viz_type == "Optimization Impact":
+        return visualizer.create_optimization_impact_chart(plan)
+    if viz_type == "Rule Coverage Heatmap":
+        return _figure_png(visualizer.create_rule_heatmap(config))
+    raise ValueError(f"Unknown visualization: {viz_type}")
+
+
+@_cache_data(show_spinner=False, ttl=_CACHE_TTL,
+             max_entries=len(_VISUALIZATIONS) * _VISUALIZATION_CACHE_CONFIGS)
+def _visualization(viz_type: str, config_key: str, _visualizer, _config, _analysis, _plan):
+    """
+    Visualization for the configuration identified by config_key
+    
+    Analysis and recommendations are derived from the configuration, so
+    config_key identifies them too. Each session gets its own copy of the
+    cached figure.
+    """
+    return _build_visualization(viz_type, _visualizer, _config, _analysis, _plan)
+
+
 class FirewallOptimizerApp:
     """Main Streamlit application class"""
     
@@ -65,21 +349,31 @@ class FirewallOptimizerApp:
             st.session_state.recommendations = None
         if 'current_rules' not in st.session_state:
             st.session_state.current_rules = ""
+        if 'config_key' not in st.session_state:
+            # Cache key of the loaded configuration; None when it has none
+            st.session_state.config_key = None
     
     def setup_components(self):
         """Initialize optimizer components"""
-        self.parser = IptablesParser()
-        self.analyzer = FirewallAnalyzer()
-        self.recommender = FirewallRecommender()
-        self.visualizer = FirewallVisualizer()
-        self.config_manager = ConfigManager()
-        self.backup_manager = BackupManager()
-        self.system_interface = SystemInterface(dry_run=True)
+        self.parser, self.analyzer, self.recommender = _pipeline_components()
+        self.visualizer, self.backup_manager = _shared_components()
+        # Backup listing shared by the header and the sidebar for this run
+        self.backups = None
+        
+        # Settings and the dry-run switch are per user, so these are built
+        # once per session rather than shared
+        if 'session_components' not in st.session_state:
+            st.session_state.session_components = (
+                ConfigManager(), SystemInterface(dry_run=True)
+            )
+        self.config_manager, self.system_interface = st.session_state.session_components
     
     def run(self):
         """Main application entry point"""
         self.render_header()
         self.render_sidebar()
+        # Sidebar actions may have changed the state shown in the header
+        self.render_status()
         self.render_main_content()
     
     def render_header(self):
@@ -92,30 +386,36 @@ class FirewallOptimizerApp:
         in your firewall configuration.
         """)
         
-        # Status indicators
-        col1, col2, col3, col4 = st.columns(4)
+        # Status indicators, filled in by render_status once the sidebar has run
+        self.status_placeholders = [col.empty() for col in st.columns(4)]
+    
+    def render_status(self):
+        """
+        Render the header's status indicators
         
-        with col1:
-            if st.session_state.config:
-                st.success("✅ Configuration Loaded")
-            else:
-                st.info("📄 No Configuration")
+        Widgets inside the tabs rerun only their tab fragment, so this runs
+        on full reruns alone; those come from the sidebar, whose actions are
+        what change the status shown here.
+        """
+        config_status, analysis_status, recommendations_status, backup_status = self.status_placeholders
         
-        with col2:
-            if st.session_state.analysis:
-                st.success("✅ Analysis Complete")
-            else:
-                st.info("🔍 No Analysis")
+        if st.session_state.config:
+            config_status.success("✅ Configuration Loaded")
+        else:
+            config_status.info("📄 No Configuration")
         
-        with col3:
-            if st.session_state.recommendations:
-                st.success("✅ Recommendations Ready")
-            else:
-                st.info("💡 No Recommendations")
+        if st.session_state.analysis:
+            analysis_status.success("✅ Analysis Complete")
+        else:
+            analysis_status.info("🔍 No Analysis")
         
-        with col4:
-            backups = self.backup_manager.list_backups()
-            st.info(f"💾 {len(backups)} Backups")
+        if st.session_state.recommendations:
+            recommendations_status.success("✅ Recommendations Ready")
+        else:
+            recommendations_status.info("💡 No Recommendations")
+        
+        backups = self.list_backups()
+        backup_status.info(f"💾 {len(backups)} Backups")
     
     def render_sidebar(self):
         """Render sidebar with navigation and controls"""
@@ -192,13 +492,13 @@ class FirewallOptimizerApp:
         uploaded_file = st.sidebar.file_uploader(
             "Choose iptables-save file",
             type=['txt', 'conf', 'rules'],
-            help="Upload output from 'iptables-save' command"
+            help="Upload output from 'iptables-save' command",
+            key="rules_upload"
         )
         
         if uploaded_file is not None:
             try:
-                content = uploaded_file.read().decode('utf-8')
-                self.load_configuration(content)
+                self.load_upload(uploaded_file)
                 st.sidebar.success("✅ File loaded successfully!")
             except Exception as e:
                 st.sidebar.error(f"❌ Error loading file: {e}")
@@ -236,15 +536,18 @@ class FirewallOptimizerApp:
         """Handle loading sample configuration"""
         if st.sidebar.button("Load Sample Configuration"):
             try:
-                sample_path = os.path.join("data", "sample_rules.txt")
-                if os.path.exists(sample_path):
-                    with open(sample_path, 'r') as f:
-                        content = f.read()
+                try:
+                    sample_mtime = _SAMPLE_PATH.stat().st_mtime
+                except OSError:
+                    sample_mtime = None
+                
+                if sample_mtime is not None:
+                    content = _read_sample(str(_SAMPLE_PATH), sample_mtime)
                     self.load_configuration(content)
                     st.sidebar.success("✅ Sample configuration loaded!")
                 else:
                     # Use built-in sample
-                    sample_rules = self.system_interface._get_sample_rules()
+                    sample_rules = _builtin_sample_rules(self.system_interface)
                     self.load_configuration(sample_rules)
                     st.sidebar.success("✅ Sample configuration loaded!")
             except Exception as e:
@@ -252,10 +555,40 @@ class FirewallOptimizerApp:
     
     def load_configuration(self, content: str):
         """Load firewall configuration from content"""
+        # An uploaded file is handed over again on every rerun; keep the
+        # analysis and recommendations made for it
+        config_key = _content_key(content)
+        if st.session_state.config and config_key == st.session_state.config_key:
+            return
+        
         try:
-            config = self.parser.parse_iptables_save(content)
+            config = _parse(content)
             st.session_state.config = config
             st.session_state.current_rules = content
+            st.session_state.config_key = config_key
+            # Reset dependent state
+            st.session_state.analysis = None
+            st.session_state.recommendations = None
+        except Exception as e:
+            st.error(f"Failed to parse configuration: {e}")
+            raise
+    
+    def load_upload(self, uploaded_file):
+        """
+        Load firewall configuration from an uploaded iptables-save file
+        
+        The file is parsed as a stream and its text is not kept in the
+        session; the raw configuration view reads it back from the uploader.
+        """
+        config_key = _content_key(uploaded_file.getbuffer())
+        if st.session_state.config and config_key == st.session_state.config_key:
+            return
+        
+        try:
+            config = _parse_upload(config_key, uploaded_file)
+            st.session_state.config = config
+            st.session_state.current_rules = ""
+            st.session_state.config_key = config_key
             # Reset dependent state
             st.session_state.analysis = None
             st.session_state.recommendations = None
@@ -267,7 +600,10 @@ class FirewallOptimizerApp:
         """Run firewall analysis"""
         try:
             with st.spinner("Analyzing firewall configuration..."):
-                analysis = self.analyzer.analyze_configuration(st.session_state.config)
+                if st.session_state.config_key:
+                    analysis = _analyze(st.session_state.config, st.session_state.config_key)
+                else:
+                    analysis = self.analyzer.analyze_configuration(st.session_state.config)
                 st.session_state.analysis = analysis
             st.success("✅ Analysis completed!")
         except Exception as e:
@@ -277,9 +613,15 @@ class FirewallOptimizerApp:
         """Generate optimization recommendations"""
         try:
             with st.spinner("Generating recommendations..."):
-                recommendations = self.recommender.generate_recommendations(
-                    st.session_state.config, st.session_state.analysis
-                )
+                if st.session_state.config_key:
+                    recommendations = _recommend(
+                        st.session_state.config, st.session_state.analysis,
+                        st.session_state.config_key
+                    )
+                else:
+                    recommendations = self.recommender.generate_recommendations(
+                        st.session_state.config, st.session_state.analysis
+                    )
                 st.session_state.recommendations = recommendations
             st.success("✅ Recommendations generated!")
         except Exception as e:
@@ -289,39 +631,63 @@ class FirewallOptimizerApp:
         """Create configuration backup"""
         try:
             description = st.text_input("Backup description (optional):")
-            backup_path = self.backup_manager.create_backup(
+            backup_path, created = self.backup_manager.create_backup(
                 st.session_state.config, description
             )
-            st.success(f"✅ Backup created: {os.path.basename(backup_path)}")
+            if created:
+                _list_backups.clear()
+                self.backups = None
+                st.success(f"✅ Backup created: {os.path.basename(backup_path)}")
+            else:
+                st.info(f"Config unchanged; latest backup is {os.path.basename(backup_path)}")
         except Exception as e:
             st.error(f"❌ Backup creation failed: {e}")
     
+    def list_backups(self):
+        """List available backups, scanning at most once per rerun"""
+        if self.backups is None:
+            backup_dir = str(self.backup_manager.backup_dir)
+            try:
+                dir_mtime = os.path.getmtime(backup_dir)
+            except OSError:
+                dir_mtime = None
+            self.backups = _list_backups(self.backup_manager, backup_dir, dir_mtime)
+        return self.backups
+    
     def show_backup_list(self):
         """Show list of available backups"""
-        backups = self.backup_manager.list_backups()
+        backups = self.list_backups()
         
         if backups:
-            st.sidebar.write("Available backups:")
-            for backup in backups[:5]:  # Show last 5 backups
-                if st.sidebar.button(
-                    f"📄 {backup['timestamp']}", 
-                    key=f"backup_{backup['filename']}"
-                ):
-                    try:
-                        config = self.backup_manager.restore_backup(backup['path'])
-                        st.session_state.config = config
-                        st.sidebar.success("✅ Backup restored!")
-                        st.rerun()
-                    except Exception as e:
-                        st.sidebar.error(f"❌ Restore failed: {e}")
+            backup = st.sidebar.selectbox(
+                "Available backups:",
+                backups[:5],  # Show last 5 backups
+                format_func=lambda b: f"📄 {b['timestamp']}",
+                key="backup_choice"
+            )
+            if st.sidebar.button("Restore Backup", key="restore_backup"):
+                try:
+                    config = self.backup_manager.restore_backup(backup['path'])
+                    st.session_state.config = config
+                    # The restored rules did not come from the loaded text
+                    st.session_state.current_rules = ""
+                    config_hash = backup.get('config_hash')
+                    st.session_state.config_key = f"backup:{config_hash}" if config_hash else None
+                    st.session_state.analysis = None
+                    st.session_state.recommendations = None
+                    st.sidebar.success("✅ Backup restored!")
+                    st.rerun()
+                except Exception as e:
+                    st.sidebar.error(f"❌ Restore failed: {e}")
     
     def reset_session(self):
         """Reset session state"""
-        for key in ['config', 'analysis', 'recommendations', 'current_rules']:
+        for key in ['config', 'analysis', 'recommendations', 'current_rules', 'config_key']:
             if key in st.session_state:
                 del st.session_state[key]
         st.rerun()
     
+    @_fragment
     def render_overview_tab(self):
         """Render overview tab"""
         if not st.session_state.config:
@@ -335,17 +701,17 @@ class FirewallOptimizerApp:
         # Summary statistics
         col1, col2, col3, col4 = st.columns(4)
         
-        total_rules = sum(len(rules) for chains in config.tables.values() 
-                         for rules in chains.values())
-        total_chains = sum(len(chains) for chains in config.tables.values())
-        total_tables = len(config.tables)
+        if st.session_state.config_key:
+            overview = _overview_stats(config, st.session_state.config_key)
+        else:
+            overview = _summarize_config(config)
         
         with col1:
-            st.metric("Total Rules", total_rules)
+            st.metric("Total Rules", overview['total_rules'])
         with col2:
-            st.metric("Total Chains", total_chains)
+            st.metric("Total Chains", overview['total_chains'])
         with col3:
-            st.metric("Total Tables", total_tables)
+            st.metric("Total Tables", overview['total_tables'])
         with col4:
             if st.session_state.analysis:
                 st.metric("Issues Found", len(st.session_state.analysis.issues))
@@ -355,27 +721,39 @@ class FirewallOptimizerApp:
         # Tables breakdown
         st.subheader("Tables and Chains")
         
-        for table_name, chains in config.tables.items():
+        for table_name, chain_rows in overview['tables']:
             with st.expander(f"📊 Table: {table_name}"):
-                for chain_name, rules in chains.items():
+                page_rows = chain_rows
+                if len(chain_rows) > _CHAINS_PER_PAGE:
+                    pages = (len(chain_rows) - 1) // _CHAINS_PER_PAGE + 1
+                    page = st.number_input(f"Page (of {pages})", 1, pages,
+                                           key=f"chains_page_{table_name}")
+                    start = (page - 1) * _CHAINS_PER_PAGE
+                    page_rows = chain_rows[start:start + _CHAINS_PER_PAGE]
+                
+                for chain_name, rule_count, rules_df in page_rows:
                     col1, col2 = st.columns([3, 1])
                     with col1:
                         st.write(f"**{chain_name}**")
                     with col2:
-                        st.write(f"{len(rules)} rules")
+                        st.write(f"{rule_count} rules")
                     
-                    if rules:
-                        # Show first few rules
-                        for i, rule in enumerate(rules[:3]):
-                            st.code(rule.raw_rule, language='bash')
-                        
-                        if len(rules) > 3:
-                            st.write(f"... and {len(rules) - 3} more rules")
+                    # One scrollable table per chain instead of a block per rule
+                    if rules_df is not None:
+                        st.dataframe(rules_df, hide_index=True, width="stretch")
         
         # Raw configuration
         with st.expander("📄 Raw Configuration"):
-            st.code(st.session_state.current_rules, language='bash')
+            uploaded_file = st.session_state.get("rules_upload")
+            if st.session_state.current_rules:
+                st.code(st.session_state.current_rules, language='bash')
+            elif (uploaded_file is not None
+                  and _content_key(uploaded_file.getbuffer()) == st.session_state.config_key):
+                # Decoded only on request so the upload's text isn't held in the session
+                if st.checkbox("Show uploaded file", key="show_uploaded_rules"):
+                    st.code(str(uploaded_file.getvalue(), 'utf-8'), language='bash')
     
+    @_fragment
     def render_analysis_tab(self):
         """Render analysis tab"""
         if not st.session_state.analysis:
@@ -411,29 +789,25 @@ class FirewallOptimizerApp:
             st.subheader("🚨 Issues Found")
             
             # Group issues by type
-            from collections import defaultdict
-            issues_by_type = defaultdict(list)
-            for issue in analysis.issues:
-                issues_by_type[issue.issue_type].append(issue)
+            if st.session_state.config_key:
+                issues_by_type = _issue_groups(analysis, st.session_state.config_key)
+            else:
+                issues_by_type = _group_issues(analysis.issues_by_type)
             
             for issue_type, issues in issues_by_type.items():
                 with st.expander(f"{issue_type.value.title()} ({len(issues)} issues)"):
-                    for issue in issues:
-                        severity_color = {
-                            'low': '🟢',
-                            'medium': '🟡', 
-                            'high': '🟠',
-                            'critical': '🔴'
-                        }.get(issue.severity.value, '⚪')
-                        
-                        st.write(f"{severity_color} **{issue.severity.value.title()}**: {issue.description}")
+                    for severity_color, issue in issues:
+                        lines = [f"{severity_color} **{issue.severity.value.title()}**: {issue.description}"]
                         if issue.recommendation:
-                            st.write(f"💡 *Recommendation: {issue.recommendation}*")
+                            lines.append(f"💡 *Recommendation: {issue.recommendation}*")
+                        if issue.affected_rules:
+                            lines.append("**Affected Rules:**")
+                        # One element per block keeps the number of page elements down
+                        st.markdown("\n\n".join(lines))
                         
                         if issue.affected_rules:
-                            st.write("**Affected Rules:**")
-                            for rule in issue.affected_rules:
-                                st.code(f"Line {rule.line_number}: {rule.raw_rule}")
+                            st.code("\n".join(f"Line {rule.line_number}: {rule.raw_rule}"
+                                              for rule in issue.affected_rules))
                         
                         st.divider()
         else:
@@ -441,12 +815,13 @@ class FirewallOptimizerApp:
         
         # Statistics
         st.subheader("📊 Statistics")
-        stats_df = pd.DataFrame([
-            {"Metric": k.replace('_', ' ').title(), "Value": v}
-            for k, v in analysis.statistics.items()
-        ])
-        st.dataframe(stats_df, use_container_width=True)
+        if st.session_state.config_key:
+            stats_table = _analysis_statistics(analysis, st.session_state.config_key)
+        else:
+            stats_table = _statistics_table(analysis.statistics)
+        st.dataframe(stats_table, width="stretch")
     
+    @_fragment
     def render_recommendations_tab(self):
         """Render recommendations tab"""
         if not st.session_state.recommendations:
@@ -476,53 +851,66 @@ class FirewallOptimizerApp:
             perf_improvement = plan.estimated_savings.get('performance_improvement', 0)
             st.metric("Est. Performance Gain", f"{perf_improvement:.1f}%")
         
-        # Recommendations by priority
-        from optimizer.recommender import RecommendationPriority
+        # Recommendations by priority, with details for the one picked in each table
+        if st.session_state.config_key:
+            groups = _recommendation_groups(plan, st.session_state.config_key)
+        else:
+            groups = _group_recommendations(plan)
         
-        for priority in [RecommendationPriority.CRITICAL, RecommendationPriority.HIGH, 
-                        RecommendationPriority.MEDIUM, RecommendationPriority.LOW]:
-            
-            priority_recs = plan.get_by_priority(priority)
-            if not priority_recs:
-                continue
-            
-            priority_color = {
-                RecommendationPriority.CRITICAL: "🔴",
-                RecommendationPriority.HIGH: "🟠", 
-                RecommendationPriority.MEDIUM: "🟡",
-                RecommendationPriority.LOW: "🟢"
-            }[priority]
-            
-            with st.expander(f"{priority_color} {priority.name.title()} Priority ({len(priority_recs)} recommendations)"):
-                for i, rec in enumerate(priority_recs):
-                    st.write(f"**{i+1}. {rec.title}**")
-                    st.write(rec.description)
-                    
-                    col1, col2 = st.columns(2)
-                    with col1:
-                        st.write(f"🎯 **Impact**: {rec.estimated_impact}")
-                    with col2:
-                        st.write(f"⚠️ **Risk**: {rec.risk_level}")
-                    
-                    if rec.implementation_notes:
-                        st.write(f"📝 **Implementation**: {rec.implementation_notes}")
-                    
-                    if rec.affected_rules:
-                        st.write("**Affected rules:**")
-                        for rule in rec.affected_rules:
-                            st.code(f"Line {rule.line_number}: {rule.raw_rule}")
-                    
-                    # Action buttons
-                    col1, col2 = st.columns(2)
-                    with col1:
-                        if st.button(f"✅ Apply", key=f"apply_{i}_{priority.value}"):
-                            st.info("This would apply the recommendation (implementation pending)")
-                    with col2:
-                        if st.button(f"❌ Dismiss", key=f"dismiss_{i}_{priority.value}"):
-                            st.info("Recommendation dismissed")
-                    
-                    st.divider()
+        for priority, priority_recs, summary_df in groups:
+            with st.expander(f"{_PRIORITY_COLOR[priority]} {priority.name.title()} Priority ({len(priority_recs)} recommendations)"):
+                selected = self.select_recommendation(priority, summary_df)
+                if selected is not None:
+                    self.render_recommendation(selected, priority_recs[selected], priority)
     
+    def select_recommendation(self, priority, summary_df) -> Optional[int]:
+        """Show a priority group's summary table and return the index picked from it"""
+        event = st.dataframe(
+            summary_df, hide_index=True, width="stretch",
+            on_select="rerun", selection_mode="single-row",
+            key=f"recs_{priority.value}"
+        )
+        if not event.selection.rows:
+            st.caption("Select a recommendation to see its details.")
+            return None
+        return event.selection.rows[0]
+    
+    def render_recommendation(self, i: int, rec, priority):
+        """Render the details and actions of one recommendation"""
+        st.markdown(f"**{i+1}. {rec.title}**\n\n{rec.description}")
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            st.write(f"🎯 **Impact**: {rec.estimated_impact}")
+        with col2:
+            st.write(f"⚠️ **Risk**: {rec.risk_level}")
+        
+        if rec.implementation_notes:
+            st.write(f"📝 **Implementation**: {rec.implementation_notes}")
+        
+        if rec.affected_rules:
+            st.write("**Affected rules:**")
+            st.code("\n".join(f"Line {rule.line_number}: {rule.raw_rule}"
+                              for rule in rec.affected_rules))
+        
+        # Action buttons
+        col1, col2 = st.columns(2)
+        with col1:
+            if st.button(f"✅ Apply", key=f"apply_{i}_{priority.value}"):
+                st.info("This would apply the recommendation (implementation pending)")
+        with col2:
+            if st.button(f"❌ Dismiss", key=f"dismiss_{i}_{priority.value}"):
+                st.info("Recommendation dismissed")
+    
+    def get_visualization(self, viz_type: str):
+        """Return the figure for viz_type, cached when the configuration has a key"""
+        args = (self.visualizer, st.session_state.config,
+                st.session_state.analysis, st.session_state.recommendations)
+        if st.session_state.config_key:
+            return _visualization(viz_type, st.session_state.config_key, *args)
+        return _build_visualization(viz_type, *args)
+    
+    @_fragment
     def render_visualizations_tab(self):
         """Render visualizations tab"""
         if not st.session_state.config:
@@ -546,16 +934,7 @@ class FirewallOptimizerApp:
             st.code("pip install plotly matplotlib")
             return
         
-        viz_type = st.selectbox(
-            "Choose visualization:",
-            [
-                "Rule Flow Diagram",
-                "Issues Dashboard", 
-                "Dependency Graph",
-                "Optimization Impact",
-                "Rule Coverage Heatmap"
-            ]
-        )
+        viz_type = st.selectbox("Choose visualization:", _VISUALIZATIONS)
         
         try:
             if viz_type == "Rule Flow Diagram":
@@ -563,40 +942,40 @@ class FirewallOptimizerApp:
                     st.warning("Plotly required for interactive diagrams. Install with: pip install plotly")
                     return
                 with st.spinner("Creating rule flow diagram..."):
-                    fig = self.visualizer.create_rule_flow_diagram(st.session_state.config)
-                    st.plotly_chart(fig, use_container_width=True)
+                    fig = self.get_visualization(viz_type)
+                    st.plotly_chart(fig, width="stretch")
             
             elif viz_type == "Issues Dashboard" and st.session_state.analysis:
                 if not plotly_available:
                     st.warning("Plotly required for dashboard. Install with: pip install plotly")
                     return
                 with st.spinner("Creating issues dashboard..."):
-                    fig = self.visualizer.create_issue_dashboard(st.session_state.analysis)
-                    st.plotly_chart(fig, use_container_width=True)
+                    fig = self.get_visualization(viz_type)
+                    st.plotly_chart(fig, width="stretch")
             
             elif viz_type == "Dependency Graph":
                 if not plotly_available:
                     st.warning("Plotly required for graph visualization. Install with: pip install plotly")
                     return
                 with st.spinner("Creating dependency graph..."):
-                    fig = self.visualizer.create_rule_dependency_graph(st.session_state.config)
-                    st.plotly_chart(fig, use_container_width=True)
+                    fig = self.get_visualization(viz_type)
+                    st.plotly_chart(fig, width="stretch")
             
             elif viz_type == "Optimization Impact" and st.session_state.recommendations:
                 if not plotly_available:
                     st.warning("Plotly required for impact charts. Install with: pip install plotly")
                     return
                 with st.spinner("Creating optimization impact chart..."):
-                    fig = self.visualizer.create_optimization_impact_chart(st.session_state.recommendations)
-                    st.plotly_chart(fig, use_container_width=True)
+                    fig = self.get_visualization(viz_type)
+                    st.plotly_chart(fig, width="stretch")
             
             elif viz_type == "Rule Coverage Heatmap":
                 if not matplotlib_available:
                     st.warning("Matplotlib required for heatmaps. Install with: pip install matplotlib")
                     return
                 with st.spinner("Creating rule coverage heatmap..."):
-                    fig = self.visualizer.create_rule_heatmap(st.session_state.config)
-                    st.pyplot(fig)
+                    png = self.get_visualization(viz_type)
+                    st.image(png, width="stretch")
             
             else:
                 if viz_type == "Issues Dashboard" and not st.session_state.analysis:
@@ -619,6 +998,7 @@ class FirewallOptimizerApp:
             elif "networkx" in str(e).lower():
                 st.info("💡 Try installing networkx: pip install networkx")
     
+    @_fragment
     def render_configuration_tab(self):
         """Render configuration tab"""
         st.header("⚙️ Configuration & Settings")